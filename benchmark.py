@@ -0,0 +1,245 @@
+"""
+Benchmarks de DreamJob.
+
+    python benchmark.py parsers [pagina1.html pagina2.html ...] [-r 20]
+    python benchmark.py arranque [-r 10]
+    python benchmark.py busqueda [-n 1000 10000 100000]
+    python benchmark.py industria [-n 1000 10000 100000]
+
+`parsers` mide cards por segundo de cada backend de parseo de LinkedIn
+instalado (selectolax / lxml / bs4) sobre páginas de resultados guardadas.
+Sin archivos, usa páginas sintéticas con la misma estructura de cards.
+
+`arranque` mide el import en frío de app.py (proceso nuevo) y lo que cuesta
+re-ejecutar el script en cada rerun de Streamlit con los módulos ya cargados.
+
+`busqueda` mide la latencia del buscador del historial (FTS5 y el índice
+en memoria del backend journal) sobre historiales sintéticos.
+
+`industria` compara analizar_industria con el bucle anterior (un `in` por
+skill conocida y por oferta, sin cache): análisis en frío, tras sumar un 1%
+de ofertas nuevas y en un rerun con el mismo conjunto.
+"""
+import argparse
+import contextlib
+import io
+import logging
+import os
+import runpy
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from random import Random
+
+
+def _pagina_sintetica(n_cards: int = 25, desde: int = 0) -> str:
+    cards = []
+    for i in range(desde, desde + n_cards):
+        cards.append(
+            f'<li><div class="base-card relative w-full base-card--link base-search-card job-search-card">'
+            f'<a class="base-card__full-link" href="https://cl.linkedin.com/jobs/view/dev-at-acme-{4000000000 + i}?trk=x">'
+            f'<span class="sr-only">Backend Developer {i}</span></a>'
+            f'<div class="base-search-card__info"><h3 class="base-search-card__title"> Backend Developer {i} </h3>'
+            f'<h4 class="base-search-card__subtitle"><a class="hidden-nested-link" href="https://cl.linkedin.com/company/acme">'
+            f' Acme {i % 7} </a></h4><div class="base-search-card__metadata">'
+            f'<span class="job-search-card__location"> Santiago, Chile </span></div></div></div></li>'
+        )
+    return f'<html><body><ul class="jobs-search__results-list">{"".join(cards)}</ul></body></html>'
+
+
+def bench_parsers(rutas: list, repeticiones: int):
+    if rutas:
+        paginas = []
+        for r in rutas:
+            with open(r, encoding="utf-8") as f:
+                paginas.append(f.read())
+        print(f"{len(paginas)} página(s) guardada(s), {repeticiones} repeticiones")
+    else:
+        paginas = [_pagina_sintetica(25, i * 25) for i in range(10)]
+        print(f"Sin páginas guardadas: 10 páginas sintéticas de 25 cards, {repeticiones} repeticiones")
+
+    referencia = None
+    from scrapers_linkedin import PARSERS_LINKEDIN
+    for nombre, parser in PARSERS_LINKEDIN.items():
+        cards = 0
+        t0 = time.perf_counter()
+        for _ in range(repeticiones):
+            for html in paginas:
+                cards += len(parser(html))
+        dt = time.perf_counter() - t0
+        salida = [parser(html) for html in paginas]
+        if referencia is None:
+            referencia = salida
+        igual = "=" if salida == referencia else "≠ bs4"
+        print(f"  {nombre:<11} {cards / dt:>10,.0f} cards/s   ({dt:.3f}s, {igual})")
+
+
+def bench_arranque(repeticiones: int):
+    raiz = os.path.dirname(os.path.abspath(__file__))
+    codigo = "import time; t = time.perf_counter(); import app; print(time.perf_counter() - t)"
+    frio = []
+    for _ in range(max(3, repeticiones // 2)):
+        out = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, cwd=raiz)
+        frio.append(float(out.stdout.strip().splitlines()[-1]))
+    print(f"  import app (frío)      {statistics.median(frio):>8.3f} s  (mediana de {len(frio)})")
+
+    # Un rerun de Streamlit vuelve a ejecutar app.py con sys.modules ya poblado.
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+    reruns = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            runpy.run_path(app.__file__, run_name="__rerun__")
+        reruns.append(time.perf_counter() - t0)
+    print(f"  rerun de app.py        {statistics.median(reruns) * 1000:>8.1f} ms (mediana de {repeticiones})")
+    print(f"  handlers de logging    {len(logging.getLogger().handlers):>8}")
+    cargados = [m for m in ("scrapers_linkedin", "scrapers_google", "selenium") if m in sys.modules]
+    print(f"  scrapers cargados      {', '.join(cargados) or 'ninguno'}")
+
+
+_PALABRAS = (
+    "python django flask backend frontend react angular sql postgres docker kubernetes aws "
+    "ingeniería desarrollo analista datos líder técnico arquitectura microservicios ágil "
+    "remoto híbrido santiago sueldo beneficios seguro salud inglés avanzado equipo"
+).split()
+
+def _historial_sintetico(n: int, seed: int = 7) -> list:
+    # Vocabulario con frecuencias tipo Zipf: pocas palabras muy comunes y una
+    # cola larga, como en descripciones reales.
+    rnd = Random(seed)
+    relleno = [f"pal{i}" for i in range(20_000)]
+    vocab = _PALABRAS + relleno
+    pesos = [1 / (r + 1) for r in range(len(vocab))]
+    rnd.shuffle(vocab)
+    return [{
+        "nombre":  f"{rnd.choice(['Desarrollador', 'Ingeniero', 'Analista', 'Líder'])} {rnd.choice(_PALABRAS)} {i}",
+        "empresa": f"Empresa {i % 997}",
+        "url":     f"https://example.com/oferta/{i}",
+        "desc":    " ".join(rnd.choices(vocab, weights=pesos, k=120)),
+        "puntaje": rnd.randint(0, 300),
+        "ultima_actualizacion": f"2026-01-01T00:00:{i % 60:02d}",
+    } for i in range(n)]
+
+def _mediana_ms(fn, repeticiones: int = 20) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn()
+        tiempos.append(time.perf_counter() - t0)
+    return statistics.median(tiempos) * 1000
+
+def bench_busqueda(tamanos: list):
+    from storage import OfertasStore, IndiceTexto
+    consultas = ["python", "ingenier sant", "kubernetes microservicios remoto", "lider tecn"]
+    for n in tamanos:
+        ofertas = _historial_sintetico(n)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = OfertasStore(os.path.join(tmp, "ofertas.db"))
+            t0 = time.perf_counter()
+            store.upsert(ofertas)
+            t_fts = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            indice = IndiceTexto(ofertas)
+            t_mem = time.perf_counter() - t0
+            print(f"{n:>7,} ofertas · upsert+FTS {t_fts:.2f}s · índice en memoria {t_mem:.2f}s")
+            for q in consultas:
+                hits = len(store.buscar(q))
+                ms_fts = _mediana_ms(lambda: store.buscar(q))
+                ms_top = _mediana_ms(lambda: store.buscar(q, limite=50))
+                ms_mem = _mediana_ms(lambda: indice.buscar(q))
+                print(f"  {q!r:<36} {hits:>7,} hits   FTS {ms_fts:>7.2f} ms   "
+                      f"FTS top-50 {ms_top:>6.2f} ms   memoria {ms_mem:>7.2f} ms")
+            store._con.close()
+
+
+def _industria_bucle(ofertas: list) -> dict:
+    """analizar_industria tal como era antes del matcher combinado (referencia)."""
+    from scoring import SKILLS_CONOCIDAS, extraer_datos
+    skill_counter   = Counter()
+    cargo_counter   = Counter()
+    empresa_counter = Counter()
+    con_sueldo      = 0
+    sueldos         = []
+    for o in ofertas:
+        texto = (o.get("nombre", "") + " " + o.get("desc", "")).lower()
+        for sk in SKILLS_CONOCIDAS:
+            if sk in texto:
+                skill_counter[sk] += 1
+        cargo_counter[o.get("nombre", "Desconocido")] += 1
+        empresa = o.get("empresa", "Desconocida")
+        if empresa not in ("Desconocida", ""):
+            empresa_counter[empresa] += 1
+        s, _ = extraer_datos(o.get("desc", ""))
+        if s:
+            con_sueldo += 1
+            sueldos.append(s)
+    return {
+        "skills":         skill_counter.most_common(20),
+        "cargos":         cargo_counter.most_common(15),
+        "empresas":       empresa_counter.most_common(10),
+        "pct_con_sueldo": round(con_sueldo / len(ofertas) * 100, 1) if ofertas else 0,
+        "sueldo_promedio":int(sum(sueldos) / len(sueldos)) if sueldos else None,
+        "sueldo_max":     max(sueldos) if sueldos else None,
+        "sueldo_min":     min(sueldos) if sueldos else None,
+    }
+
+def bench_industria(tamanos: list):
+    import scoring
+    for n in tamanos:
+        ofertas = _historial_sintetico(int(n * 1.01))
+        for i, o in enumerate(ofertas):
+            if i % 3 == 0:
+                o["desc"] += f" Renta líquida ${1_000_000 + i % 2_000_000:,} con javascript y ci/cd".replace(",", ".")
+        ofertas, nuevas = ofertas[:n], ofertas[n:]
+        # Como en la app: el scoring ya pasó por el cache de extracción.
+        _industria_bucle(ofertas)
+        t0 = time.perf_counter()
+        antes = _industria_bucle(ofertas)
+        t_bucle = time.perf_counter() - t0
+
+        scoring._CACHE_INDUSTRIA.clear()
+        scoring._FEATURES_INDUSTRIA.clear()
+        t0 = time.perf_counter()
+        ahora = scoring.analizar_industria(ofertas)
+        t_frio = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        scoring.analizar_industria(ofertas)
+        t_rerun = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        scoring.analizar_industria(ofertas + nuevas)
+        t_incr = time.perf_counter() - t0
+        igual = "=" if ahora == antes else "≠"
+        print(f"{n:>7,} ofertas   bucle {t_bucle:>7.3f}s   nuevo {t_frio:>7.3f}s ({t_bucle / t_frio:>4.1f}x, {igual})"
+              f"   +1% ofertas {t_incr * 1000:>7.1f} ms   rerun {t_rerun * 1000:>6.1f} ms")
+
+
+def main():
+    ap  = argparse.ArgumentParser(description="Benchmarks de DreamJob")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_parsers = sub.add_parser("parsers", help="cards/s de cada backend de parseo LinkedIn")
+    p_parsers.add_argument("paginas", nargs="*", help="HTML de resultados guardados")
+    p_parsers.add_argument("-r", "--repeticiones", type=int, default=20)
+    p_arranque = sub.add_parser("arranque", help="import en frío de app.py y costo de cada rerun")
+    p_arranque.add_argument("-r", "--repeticiones", type=int, default=10)
+    p_busqueda = sub.add_parser("busqueda", help="latencia del buscador del historial")
+    p_busqueda.add_argument("-n", "--tamanos", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    p_industria = sub.add_parser("industria", help="analizar_industria vs el bucle sin cache")
+    p_industria.add_argument("-n", "--tamanos", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = ap.parse_args()
+
+    if args.cmd == "parsers":
+        bench_parsers(args.paginas, args.repeticiones)
+    elif args.cmd == "arranque":
+        bench_arranque(args.repeticiones)
+    elif args.cmd == "busqueda":
+        bench_busqueda(args.tamanos)
+    elif args.cmd == "industria":
+        bench_industria(args.tamanos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Configuración compartida de DreamJob: logging, rutas de archivos, perfil del
+usuario y el contrato de progreso que usan los scrapers. No depende de
+Streamlit: lo importan la app, la CLI y los benchmarks.
+"""
+import atexit
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+
+# ─────────────────────────────────────────────
+# 0. LOGGING
+# ─────────────────────────────────────────────
+LOG_FILE = "dreamjob.log"
+LOG_MAX_MB  = float(os.environ.get("DREAMJOB_LOG_MB", "5"))
+LOG_BACKUPS = 3
+log = logging.getLogger("dreamjob")
+
+_init_lock    = threading.Lock()
+_inicializado = False
+_listener     = None
+
+def inicializar(consola=None, nivel_consola=logging.INFO):
+    """
+    Configura el logging del proceso una sola vez. Streamlit re-ejecuta
+    app.py en cada interacción: las llamadas siguientes no abren otro
+    handler ni vuelven a loguear el arranque.
+
+    Los hilos que loguean solo encolan el registro (QueueHandler); un
+    QueueListener escribe al archivo rotativo y a la consola fuera del
+    camino caliente.
+    """
+    global _inicializado, _listener
+    with _init_lock:
+        if _inicializado:
+            return
+        formato = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
+        file_handler = logging.handlers.RotatingFileHandler(
+            LOG_FILE, maxBytes=int(LOG_MAX_MB * 1024 * 1024), backupCount=LOG_BACKUPS, encoding="utf-8"
+        )
+        file_handler.setFormatter(formato)
+        console_handler = logging.StreamHandler(consola or sys.stdout)
+        console_handler.setFormatter(formato)
+        console_handler.setLevel(nivel_consola)
+
+        cola = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(
+            cola, file_handler, console_handler, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(_listener.stop)  # vacía la cola al salir
+        raiz = logging.getLogger()
+        raiz.setLevel(logging.DEBUG)
+        raiz.addHandler(logging.handlers.QueueHandler(cola))  # sin formatter: formatea el listener
+        _inicializado = True
+    log.info("🚀 Sistema DreamJob iniciado.")
+
+def leer_cola_log(ruta: str = LOG_FILE, lineas: int = 150, bloque: int = 8192) -> str:
+    """
+    Últimas `lineas` del log leyendo bloques desde el final del archivo:
+    el costo depende de lo que se muestra, no del tamaño del log.
+    """
+    try:
+        f = open(ruta, "rb")
+    except FileNotFoundError:
+        return ""
+    with f:
+        fin = f.seek(0, os.SEEK_END)
+        pos, trozos, saltos = fin, [], 0
+        # lineas + 1 saltos: la primera línea del bloque puede venir cortada
+        while pos > 0 and saltos <= lineas:
+            paso = min(bloque, pos)
+            pos -= paso
+            f.seek(pos)
+            trozo = f.read(paso)
+            trozos.append(trozo)
+            saltos += trozo.count(b"\n")
+    datos = b"".join(reversed(trozos))
+    return b"\n".join(datos.splitlines()[-lineas:]).decode("utf-8", errors="replace")
+
+def recurso_proceso(fn):
+    """
+    Equivalente a st.cache_resource sin depender de Streamlit: un único objeto
+    por proceso (y por argumentos), creado bajo lock porque el primer uso
+    puede llegar desde varios hilos worker a la vez.
+    """
+    lock    = threading.Lock()
+    creados = {}
+
+    @functools.wraps(fn)
+    def obtener(*args):
+        if args not in creados:
+            with lock:
+                if args not in creados:
+                    creados[args] = fn(*args)
+        return creados[args]
+    obtener.cache_clear = creados.clear
+    return obtener
+
+OFERTAS_FILE = "ofertas_encontradas.json"
+EXTRACCION_FILE = os.path.splitext(OFERTAS_FILE)[0] + ".extracciones.json"
+
+# ─────────────────────────────────────────────
+# 1. PERSISTENCIA PERFIL
+# ─────────────────────────────────────────────
+PERFIL_FILE = "perfil_usuario.json"
+GOOGLE_LOTE = 3  # ofertas por búsqueda / "Ver más" (configurable en la sidebar)
+DEFAULT_PERFIL = {
+    "skills":               ["Python", "SQL", "React"],
+    "beneficios":           ["Remoto", "Seguro médico", "Bono"],
+    "cargos":               ["Tech Lead", "Software Architect", "Fullstack Developer"],
+    "renta_min":            1_200_000,
+    "renta_max":            3_000_000,
+    "prioridad_cargos":     9,
+    "prioridad_skills":     8,
+    "prioridad_sueldo":     7,
+    "prioridad_beneficios": 6,
+    "prioridad_experiencia":5,
+    "experiencia_min":      0,
+    "experiencia_max":      10,
+    "linkedin_ubicacion":   "Chile",
+    "linkedin_paginas":     3,
+    "linkedin_paginas_vacias": 1,
+    "linkedin_paralelo":    3,
+    "linkedin_detalle":     True,
+    "linkedin_por_cargo":   True,
+    "linkedin_variantes":   "",
+    "google_lote":          GOOGLE_LOTE,
+    "google_workers":       1,
+    "google_descripcion_completa": True,
+}
+
+def escribir_json_atomico(ruta: str, data, **kwargs):
+    """Escribe a un archivo temporal y lo renombra: nunca deja el JSON truncado."""
+    tmp = f"{ruta}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, **kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, ruta)
+
+
+def cargar_perfil(ruta: str = None) -> dict:
+    ruta = ruta or PERFIL_FILE
+    if os.path.exists(ruta):
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for k, v in DEFAULT_PERFIL.items():
+                if k not in data:
+                    data[k] = v
+            log.info("Perfil cargado.")
+            return data
+        except Exception as e:
+            log.error(f"Error cargando perfil: {e}")
+    return DEFAULT_PERFIL.copy()
+
+def guardar_perfil(perfil: dict):
+    escribir_json_atomico(PERFIL_FILE, perfil, indent=2)
+    log.info("Perfil guardado.")
+
+
+def planificar_busquedas(perfil: dict) -> list:
+    """
+    Plan de búsqueda LinkedIn: una consulta por cargo del perfil, en la
+    ubicación principal y en cada variante de `linkedin_variantes`
+    (separadas por ";"). Devuelve [(query, ubicacion), ...].
+    """
+    ubicaciones = [perfil.get("linkedin_ubicacion", "Chile")]
+    ubicaciones += [u.strip() for u in perfil.get("linkedin_variantes", "").split(";")]
+    ubicaciones = list(dict.fromkeys(u for u in ubicaciones if u))
+    cargos = list(dict.fromkeys(c.strip() for c in perfil.get("cargos", []) if c.strip())) or ["Developer"]
+    return [(c, u) for c in cargos for u in ubicaciones]
+
+
+# ── Progreso sin Streamlit ─────────────────────────────────
+class ReporteProgreso:
+    """
+    Mismo contrato que la pareja st.progress / st.empty que reciben los
+    scrapers (`.progress(fraccion)` y `.markdown(texto)`), pero reenviado a
+    callbacks. Permite correrlos sin Streamlit (CLI, cron).
+    """
+
+    def __init__(self, on_progreso=None, on_estado=None):
+        self.on_progreso = on_progreso
+        self.on_estado   = on_estado
+
+    def progress(self, fraccion: float):
+        if self.on_progreso:
+            self.on_progreso(float(fraccion))
+
+    def markdown(self, texto: str):
+        if self.on_estado:
+            self.on_estado(texto)
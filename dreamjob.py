@@ -0,0 +1,187 @@
+"""
+DreamJob sin navegador: corre búsquedas, puntúa contra el perfil y persiste
+en el mismo historial que la app.
+
+    python dreamjob.py                                  # una consulta por cargo del perfil
+    python dreamjob.py -q "Tech Lead" -q "Python Developer"
+    python dreamjob.py --fuente google --lote 10 --workers 2 --resumen resumen.json
+
+El avance va a stderr; el resumen (ofertas, tiempos y throughput por consulta)
+sale como JSON por stdout, o a --resumen.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import config
+from scoring import PipelineMatch
+from storage import cargar_urls_existentes, obtener_store
+
+_RE_MARKDOWN = re.compile(r"[*`]")
+
+
+def _reporte(etiqueta: str) -> config.ReporteProgreso:
+    """Estado de los scrapers como líneas `[etiqueta] mensaje` en stderr."""
+    def _estado(texto):
+        print(f"[{etiqueta}] {_RE_MARKDOWN.sub('', texto)}", file=sys.stderr, flush=True)
+    return config.ReporteProgreso(on_estado=_estado)
+
+
+def _metricas(query: str, ubicacion: str, fuente: str, pipeline, dt: float, error, **extra) -> dict:
+    resultados = pipeline.resultados if pipeline else []
+    return {
+        "query":              query,
+        "ubicacion":          ubicacion,
+        "fuente":             fuente,
+        "ofertas":            len(resultados),
+        "segundos":           round(dt, 3),
+        "ofertas_por_segundo": round(len(resultados) / dt, 2) if dt else None,
+        "primer_resultado_s": round(pipeline.t_primero, 3) if pipeline and pipeline.t_primero is not None else None,
+        "mejor_puntaje":      max((int(r["Puntaje"]) for r in resultados), default=None),
+        "error":              error,
+        **extra,
+    }
+
+
+def correr_linkedin(plan: list, perfil: dict, vistas, args, paralelo: int) -> list:
+    """
+    Todo el plan en un solo iterar_plan_linkedin, como la app: las consultas
+    corren a la vez en un pool de `paralelo` páginas en vuelo (--workers, o
+    `linkedin_paralelo` del perfil) bajo el token bucket del proceso. Cada
+    consulta tiene su PipelineMatch para las métricas; sus `segundos` van
+    hasta que llegó su última página.
+    """
+    from scrapers_linkedin import enriquecer_linkedin, iterar_plan_linkedin  # requests/bs4 solo si se usa
+    reporte  = _reporte("linkedin")
+    t0       = time.perf_counter()
+    estado   = {qu: {"pipeline": PipelineMatch(perfil), "paginas": 0, "fin": None} for qu in plan}
+    error    = None
+    try:
+        for query, ubicacion, _, nuevas in iterar_plan_linkedin(
+            plan, args.paginas or perfil.get("linkedin_paginas", 3), reporte, reporte, vistas,
+            paralelo=paralelo,
+            paginas_vacias=args.paginas_vacias or perfil.get("linkedin_paginas_vacias", 1),
+        ):
+            e = estado[(query, ubicacion)]
+            e["paginas"] += 1
+            if nuevas and not args.sin_detalle:
+                enriquecer_linkedin(nuevas, reporte, reporte, paralelo=paralelo)
+            e["pipeline"].procesar(nuevas)
+            e["fin"] = time.perf_counter()
+    except Exception as ex:
+        config.log.error(f"CLI: plan LinkedIn falló: {ex}")
+        error = str(ex)
+
+    consultas = []
+    for (query, ubicacion), e in estado.items():
+        e["pipeline"].cerrar()
+        # Una consulta sin ninguna página entregada falló en la primera (el detalle está en el log).
+        fallo = error or (None if e["paginas"] else "ninguna página respondió")
+        dt = (e["fin"] or time.perf_counter()) - t0
+        consultas.append(_metricas(query, ubicacion, "linkedin", e["pipeline"], dt, fallo, paginas=e["paginas"]))
+    return consultas
+
+
+def correr_google(query: str, ubicacion: str, perfil: dict, vistas, args) -> dict:
+    from scrapers_google import scrape_google_jobs  # Selenium solo si se usa Google
+    reporte  = _reporte(query)
+    pipeline = PipelineMatch(perfil)
+    t0       = time.perf_counter()
+    try:
+        _, siguiente, total = scrape_google_jobs(
+            query, ubicacion, reporte, reporte, vistas,
+            desde_idx=0, lote=args.lote or perfil.get("google_lote", config.GOOGLE_LOTE),
+            workers=perfil.get("google_workers", 1), headless=True,
+            on_oferta=lambda o: pipeline.procesar([o]),
+            descripcion_completa=not args.sin_detalle,
+        )
+        extra, error = {"bloques": total, "siguiente_idx": siguiente}, None
+    except Exception as e:
+        config.log.error(f"CLI: consulta '{query}' falló: {e}")
+        extra, error = {}, str(e)
+    pipeline.cerrar()
+    return _metricas(query, ubicacion, "google", pipeline, time.perf_counter() - t0, error, **extra)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="dreamjob", description="Búsqueda y match de ofertas sin UI")
+    ap.add_argument("-q", "--query", action="append",
+                    help="consulta (repetible); por defecto una por cargo del perfil × ubicaciones")
+    ap.add_argument("--perfil", help=f"JSON de perfil (por defecto {config.PERFIL_FILE})")
+    ap.add_argument("--fuente", choices=("linkedin", "google"), default="linkedin")
+    ap.add_argument("--ubicacion", help="sobrescribe linkedin_ubicacion del perfil")
+    ap.add_argument("--paginas", type=int, help="páginas LinkedIn por consulta")
+    ap.add_argument("--paginas-vacias", type=int,
+                    help="LinkedIn: parar tras N páginas seguidas sin ofertas nuevas")
+    ap.add_argument("--lote", type=int, help="ofertas Google por consulta")
+    ap.add_argument("--workers", type=int,
+                    help="paralelismo: consultas Google a la vez, o páginas LinkedIn en vuelo para todo "
+                         "el plan (por defecto 1 en Google y linkedin_paralelo del perfil en LinkedIn)")
+    ap.add_argument("--sin-detalle", action="store_true",
+                    help="no descargar la descripción completa (LinkedIn) ni abrir paneles (Google)")
+    ap.add_argument("--resumen", help="escribe el resumen JSON en este archivo en vez de stdout")
+    ap.add_argument("-v", "--verbose", action="store_true", help="log de la app también en stderr")
+    args = ap.parse_args(argv)
+
+    # stdout queda reservado para el resumen: el log de consola y los print de
+    # los scrapers se van a stderr.
+    config.inicializar(consola=sys.stderr, nivel_consola=logging.DEBUG if args.verbose else logging.WARNING)
+
+    perfil = config.cargar_perfil(args.perfil)
+    if args.ubicacion:
+        perfil["linkedin_ubicacion"] = args.ubicacion
+    if args.query:
+        plan = [(q, perfil.get("linkedin_ubicacion", "Chile")) for q in args.query]
+    else:
+        plan = config.planificar_busquedas(perfil)
+    vistas  = cargar_urls_existentes()  # compartida: una oferta no se procesa en dos consultas
+
+    inicio, t0 = datetime.now().isoformat(timespec="seconds"), time.perf_counter()
+    if args.fuente == "linkedin":
+        workers = max(1, args.workers or perfil.get("linkedin_paralelo", 3))
+    else:
+        workers = max(1, args.workers or 1)
+    with contextlib.redirect_stdout(sys.stderr):
+        if args.fuente == "linkedin":
+            consultas = correr_linkedin(plan, perfil, vistas, args, workers)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                consultas = list(pool.map(lambda qu: correr_google(*qu, perfil, vistas, args), plan))
+    dt = time.perf_counter() - t0
+
+    total = sum(c["ofertas"] for c in consultas)
+    scraper_li = sys.modules.get("scrapers_linkedin")  # el cache HTTP solo existe si se usó LinkedIn
+    cache = scraper_li.obtener_cache_http() if scraper_li else None
+    resumen = {
+        "inicio":              inicio,
+        "fuente":              args.fuente,
+        "workers":             workers,  # el paralelismo efectivo, no solo el flag
+        "consultas":           consultas,
+        "ofertas":             total,
+        "segundos":            round(dt, 3),
+        "ofertas_por_segundo": round(total / dt, 2) if dt else None,
+        "historial":           obtener_store().total(),
+        "cache_http": {
+            "aciertos":    cache.aciertos,
+            "revalidados": cache.revalidados,
+            "descargas":   cache.descargas,
+            "tasa":        round(cache.tasa_aciertos(), 3),
+        } if cache else None,
+    }
+    texto = json.dumps(resumen, ensure_ascii=False, indent=2)
+    if args.resumen:
+        with open(args.resumen, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+    return 1 if any(c["error"] for c in consultas) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
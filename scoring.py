@@ -0,0 +1,651 @@
+"""
+Extracción de sueldo/experiencia, motor de matching (MatchEngine + scoring
+matricial en NumPy), pipeline de scoring en streaming y análisis de industria.
+"""
+import copy
+import hashlib
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from config import EXTRACCION_FILE, escribir_json_atomico, log, recurso_proceso
+from storage import guardar_ofertas_json
+
+
+# Claves del perfil que afectan el puntaje. Si ninguna cambió entre reruns
+# no hace falta re-puntuar.
+CLAVES_SCORING = (
+    "cargos", "skills", "beneficios",
+    "renta_min", "renta_max", "experiencia_min", "experiencia_max",
+    "prioridad_cargos", "prioridad_skills", "prioridad_sueldo",
+    "prioridad_beneficios", "prioridad_experiencia",
+)
+
+# Una línea por oferta puntuada inunda el log en búsquedas grandes: se deja
+# constancia (en DEBUG) de 1 de cada MUESTREO_LOG_MATCH; el resumen por lote
+# sigue en INFO.
+MUESTREO_LOG_MATCH = 100
+_contador_match = itertools.count()
+
+def clave_scoring(perfil: dict) -> str:
+    return json.dumps({k: perfil.get(k) for k in CLAVES_SCORING}, sort_keys=True, ensure_ascii=False)
+
+
+# ─────────────────────────────────────────────
+# 4. EXTRACCIÓN
+# ─────────────────────────────────────────────
+# Compiladas una vez. El prefijo opcional `\$?\s*` no cambia el grupo capturado
+# ni m.end(), y quitarlo permite al motor de regex saltar directo a los dígitos.
+_PATRONES_SUELDO = [
+    re.compile(r"(\d{1,2}[.,]\d{3}[.,]\d{3})", re.IGNORECASE),
+    re.compile(r"(\d{1,2}[.,]\d{3})\s*(?:mil|k)", re.IGNORECASE),
+    re.compile(r"(\d{6,8})", re.IGNORECASE),
+]
+_PATRON_EXPERIENCIA = re.compile(r"(\d+)\s*(?:años|years|yrs|year|año)", re.IGNORECASE)
+
+def extraer_sueldo(texto: str):
+    for pat in _PATRONES_SUELDO:
+        m = pat.search(texto)
+        if m:
+            raw = m.group(1).replace(".", "").replace(",", "")
+            try:
+                val = int(raw)
+                ctx = texto[max(0, m.end()-15): m.end()+5].lower()
+                if "mil" in ctx or "k" in ctx:
+                    val *= 1000
+                return val
+            except:
+                pass
+    return None
+
+def extraer_experiencia(texto: str):
+    m = _PATRON_EXPERIENCIA.search(texto)
+    return int(m.group(1)) if m else None
+
+
+class CacheExtraccion:
+    """
+    Cache LRU acotado de (sueldo, experiencia) indexado por el hash de la
+    descripción. Se persiste como sidecar junto a OFERTAS_FILE, así que los
+    reruns y los análisis repetidos no vuelven a correr las regex de
+    extracción para descripciones ya vistas.
+    """
+    VERSION = 1  # subir si cambian _PATRONES_SUELDO / _PATRON_EXPERIENCIA
+
+    def __init__(self, ruta: str, max_items: int = 50_000):
+        self.ruta      = ruta
+        self.max_items = max_items
+        self._datos    = OrderedDict()
+        self._lock     = threading.Lock()
+        self._sucio    = False
+        self.hits = self.misses = 0
+        self._cargar()
+
+    def _cargar(self):
+        if not os.path.exists(self.ruta):
+            return
+        try:
+            with open(self.ruta, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                for k, v in data.get("entradas", {}).items():
+                    self._datos[k] = tuple(v)
+            log.info(f"Cache de extracción: {len(self._datos)} entradas cargadas.")
+        except Exception as e:
+            log.error(f"Error cargando {self.ruta}: {e}")
+
+    @staticmethod
+    def clave(texto: str) -> str:
+        return hashlib.blake2b(texto.encode("utf-8"), digest_size=16).hexdigest()
+
+    def obtener(self, texto: str) -> tuple:
+        k = self.clave(texto)
+        with self._lock:
+            v = self._datos.get(k)
+            if v is not None:
+                self._datos.move_to_end(k)
+                self.hits += 1
+                return v
+        v = (extraer_sueldo(texto), extraer_experiencia(texto))
+        with self._lock:
+            self.misses += 1
+            self._datos[k] = v
+            self._sucio = True
+            while len(self._datos) > self.max_items:
+                self._datos.popitem(last=False)
+        return v
+
+    def consultar(self, texto: str):
+        """(sueldo, experiencia) si el texto ya está en cache; None si no (no extrae)."""
+        with self._lock:
+            return self._datos.get(self.clave(texto))
+
+    def guardar(self):
+        with self._lock:
+            if not self._sucio:
+                return
+            salida = {"version": self.VERSION, "entradas": dict(self._datos)}
+            self._sucio = False
+        try:
+            escribir_json_atomico(self.ruta, salida, separators=(",", ":"))
+        except Exception as e:
+            log.error(f"Error escribiendo {self.ruta}: {e}")
+
+
+@recurso_proceso
+def cache_extraccion() -> CacheExtraccion:
+    # Un solo objeto por proceso: sobrevive a los reruns de Streamlit.
+    return CacheExtraccion(EXTRACCION_FILE)
+
+def extraer_datos(texto: str) -> tuple:
+    """(sueldo, experiencia) de un texto, usando el cache de extracción."""
+    return cache_extraccion().obtener(texto)
+
+
+# ─────────────────────────────────────────────
+# 5. MOTOR MATCHING
+# ─────────────────────────────────────────────
+def match_lista(texto: str, lista: list, es_priorizada=False):
+    texto_l = texto.lower()
+    n = len(lista)
+    puntos, display = 0, []
+    for i, item in enumerate(lista):
+        mult = (n - i) if es_priorizada else 1
+        if item.lower() in texto_l:
+            display.append(f"✅ {item}")
+            puntos += 10 * mult
+        else:
+            display.append(item)
+    return puntos, ", ".join(display)
+
+def match_sueldo(val, rmin, rmax, prio):
+    if val is None:
+        return 0, "❓ No especificado"
+    if rmin <= val <= rmax:
+        return 50 * prio, f"✅ ${val:,}"
+    elif val < rmin:
+        return 0, f"🔴 ${val:,} (bajo)"
+    else:
+        return 10 * prio, f"🟡 ${val:,} (sobre rango)"
+
+def match_experiencia(val, emin, emax, prio):
+    if val is None:
+        return 0, "❓ No especificado"
+    if emin <= val <= emax:
+        return 20 * prio, f"✅ {val} años"
+    diff = abs(val - emin) if val < emin else abs(val - emax)
+    return max(0, 20 * prio - diff * 5), f"⚠️ {val} años"
+
+class MatchEngine:
+    """
+    Motor de matching compilado para UNA versión del perfil (cargos, skills y
+    beneficios). Todos los términos se compilan una sola vez en una regex
+    combinada, de modo que cada texto de oferta se recorre en una única pasada
+    en vez de un `in` por término.
+
+    Las alternativas van ordenadas de más larga a más corta, así que en cada
+    posición de inicio se captura el término más largo que empieza ahí; la
+    búsqueda se reanuda en la posición siguiente para no perder solapes. Los
+    términos contenidos en él (p.ej. "java" dentro de "javascript" o
+    "sql" dentro de "postgresql") se agregan vía `_contenidos`, con lo que el
+    resultado es idéntico al `item.lower() in texto.lower()` original.
+    """
+
+    def __init__(self, cargos: list, skills: list, beneficios: list):
+        self.cargos     = list(cargos)
+        self.skills     = list(skills)
+        self.beneficios = list(beneficios)
+        self._re_cargos, self._cont_cargos, self._vacios_cargos = self._compilar(self.cargos)
+        self._re_desc,   self._cont_desc,   self._vacios_desc   = self._compilar(self.skills + self.beneficios)
+
+    @staticmethod
+    def _compilar(terminos: list):
+        unicos = {t.lower() for t in terminos}
+        vacios = {t for t in unicos if not t}
+        unicos -= vacios
+        if not unicos:
+            return None, {}, vacios
+        ordenados = sorted(unicos, key=len, reverse=True)
+        regex = re.compile("|".join(re.escape(t) for t in ordenados))
+        contenidos = {t: {u for u in unicos if u in t} for t in unicos}
+        return regex, contenidos, vacios
+
+    @staticmethod
+    def _buscar(regex, contenidos: dict, vacios: set, texto_l: str) -> set:
+        hits = set(vacios)
+        if regex is None:
+            return hits
+        vistos = set()
+        m = regex.search(texto_l)
+        while m:
+            t = m.group()
+            if t not in vistos:
+                vistos.add(t)
+                hits |= contenidos[t]
+            m = regex.search(texto_l, m.start() + 1)
+        return hits
+
+    def extraer(self, oferta: dict) -> dict:
+        """Features de la oferta independientes de los pesos del perfil."""
+        nombre = oferta.get("nombre", "")
+        desc   = oferta.get("desc", "")
+        sueldo, experiencia = extraer_datos(desc)
+        return {
+            "cargos":      self._buscar(self._re_cargos, self._cont_cargos, self._vacios_cargos, nombre.lower()),
+            "terminos":    self._buscar(self._re_desc, self._cont_desc, self._vacios_desc, desc.lower()),
+            "sueldo":      sueldo,
+            "experiencia": experiencia,
+        }
+
+    @staticmethod
+    def _puntos_lista(lista: list, hits: set):
+        n = len(lista)
+        puntos, display = 0, []
+        for i, item in enumerate(lista):
+            if item.lower() in hits:
+                display.append(f"✅ {item}")
+                puntos += 10 * (n - i)
+            else:
+                display.append(item)
+        return puntos, ", ".join(display)
+
+    def puntuar(self, oferta: dict, feats: dict, perfil: dict) -> dict:
+        """Aplica los pesos del perfil a features ya extraídas (sin escanear texto)."""
+        nombre = oferta.get("nombre", "")
+
+        pts_c, nombre_display = 0, nombre
+        for i, cargo in enumerate(self.cargos):
+            if cargo.lower() in feats["cargos"]:
+                pts_c = 10 * (len(self.cargos) - i) * perfil.get("prioridad_cargos", 9) // 5
+                nombre_display = f"✅ {nombre}"
+                break
+
+        pts_sk, txt_sk = self._puntos_lista(self.skills, feats["terminos"])
+        pts_sk = pts_sk * perfil["prioridad_skills"] // 5
+
+        pts_s, txt_s = match_sueldo(
+            feats["sueldo"],
+            perfil["renta_min"], perfil["renta_max"], perfil["prioridad_sueldo"]
+        )
+        pts_e, txt_e = match_experiencia(
+            feats["experiencia"],
+            perfil["experiencia_min"], perfil["experiencia_max"], perfil["prioridad_experiencia"]
+        )
+        pts_b, txt_b = self._puntos_lista(self.beneficios, feats["terminos"])
+        pts_b = pts_b * perfil["prioridad_beneficios"] // 5
+
+        total = pts_c + pts_sk + pts_s + pts_e + pts_b
+        if next(_contador_match) % MUESTREO_LOG_MATCH == 0:
+            log.debug("Match '%s': %s pts (muestra 1/%d)", nombre, total, MUESTREO_LOG_MATCH)
+
+        return {
+            "Puntaje":      total,
+            "Nombre":       nombre_display,
+            "Empresa":      oferta.get("empresa", ""),
+            "URL":          oferta.get("url", "#"),
+            "Sueldo":       txt_s,
+            "Skills":       txt_sk,
+            "Experiencia":  txt_e,
+            "Beneficios":   txt_b,
+            "Descripcion":  oferta.get("desc", ""),
+        }
+
+    def calcular(self, oferta: dict, perfil: dict) -> dict:
+        return self.puntuar(oferta, self.extraer(oferta), perfil)
+
+
+_MOTORES: dict = {}
+
+def obtener_motor(perfil: dict) -> MatchEngine:
+    """Devuelve el MatchEngine de la versión actual del perfil (se compila una vez)."""
+    clave = (
+        tuple(perfil.get("cargos", [])),
+        tuple(perfil.get("skills", [])),
+        tuple(perfil.get("beneficios", [])),
+    )
+    motor = _MOTORES.get(clave)
+    if motor is None:
+        if len(_MOTORES) >= 8:
+            _MOTORES.clear()
+        motor = _MOTORES[clave] = MatchEngine(*clave)
+    return motor
+
+def calcular_match(oferta: dict, perfil: dict) -> dict:
+    return obtener_motor(perfil).calcular(oferta, perfil)
+
+
+# ── Scoring por lotes (NumPy) ──────────────────────────────
+class MatrizOfertas:
+    """
+    Features de un lote de ofertas en forma matricial: una columna booleana por
+    término del perfil (cargos sobre el nombre, skills/beneficios sobre la
+    descripción) más los vectores de sueldo y años parseados. Se construye con
+    una sola pasada del MatchEngine por oferta; después cualquier cambio de
+    pesos se resuelve con productos matriz-vector, sin volver a leer texto.
+    """
+
+    def __init__(self, ofertas: list, motor: MatchEngine):
+        self.ofertas = ofertas
+        n = len(ofertas)
+        feats = [motor.extraer(o) for o in ofertas]
+        # Textos en minúsculas: permiten calcular la columna de un término nuevo
+        # sin re-extraer sueldo/experiencia ni el resto de los términos.
+        self._nombres_l = [o.get("nombre", "").lower() for o in ofertas]
+        self._descs_l   = [o.get("desc", "").lower() for o in ofertas]
+        self.cargos = {}
+        self.terminos = {}
+        for t in {c.lower() for c in motor.cargos}:
+            self.cargos[t] = np.fromiter((t in f["cargos"] for f in feats), dtype=bool, count=n)
+        for t in {x.lower() for x in motor.skills + motor.beneficios}:
+            self.terminos[t] = np.fromiter((t in f["terminos"] for f in feats), dtype=bool, count=n)
+        self.sueldo = np.array(
+            [np.nan if f["sueldo"] is None else f["sueldo"] for f in feats], dtype=float
+        ).reshape(n)
+        self.experiencia = np.array(
+            [np.nan if f["experiencia"] is None else f["experiencia"] for f in feats], dtype=float
+        ).reshape(n)
+
+    def __len__(self):
+        return len(self.ofertas)
+
+    @staticmethod
+    def _columna(textos: list, termino: str) -> np.ndarray:
+        return np.fromiter((termino in t for t in textos), dtype=bool, count=len(textos))
+
+    def sincronizar(self, perfil: dict) -> list:
+        """
+        Ajusta las columnas a las listas actuales del perfil: calcula SOLO los
+        términos nuevos y descarta los eliminados. Reordenar una lista no toca
+        nada (el orden solo afecta los pesos). Devuelve los términos recalculados.
+        """
+        cambios = []
+        req_cargos = {c.lower() for c in perfil.get("cargos", [])}
+        req_terms  = {t.lower() for t in perfil.get("skills", []) + perfil.get("beneficios", [])}
+        for columnas, requeridos, textos in (
+            (self.cargos,   req_cargos, self._nombres_l),
+            (self.terminos, req_terms,  self._descs_l),
+        ):
+            for t in set(columnas) - requeridos:
+                del columnas[t]
+            for t in requeridos - set(columnas):
+                columnas[t] = self._columna(textos, t)
+                cambios.append(t)
+        if cambios:
+            log.info(f"Matriz de ofertas: recalculadas columnas {cambios}")
+        return cambios
+
+    def extender(self, otra: "MatrizOfertas"):
+        """
+        Anexa las filas de `otra` (un micro-lote del pipeline). Si alguna de
+        las dos no tiene la columna de un término, se calcula solo para ella.
+        """
+        for columnas, otras, textos, textos_otra in (
+            (self.cargos,   otra.cargos,   self._nombres_l, otra._nombres_l),
+            (self.terminos, otra.terminos, self._descs_l,   otra._descs_l),
+        ):
+            for t in set(columnas) | set(otras):
+                propia = columnas[t] if t in columnas else self._columna(textos, t)
+                ajena  = otras[t] if t in otras else self._columna(textos_otra, t)
+                columnas[t] = np.concatenate([propia, ajena])
+        self.ofertas     = self.ofertas + otra.ofertas
+        self._nombres_l += otra._nombres_l
+        self._descs_l   += otra._descs_l
+        self.sueldo      = np.concatenate([self.sueldo, otra.sueldo])
+        self.experiencia = np.concatenate([self.experiencia, otra.experiencia])
+
+    def matriz(self, columnas: dict, lista: list) -> np.ndarray:
+        """Matriz ofertas × lista (en el orden de prioridad del perfil)."""
+        if not lista:
+            return np.zeros((len(self), 0), dtype=bool)
+        return np.column_stack([columnas[t.lower()] for t in lista])
+
+
+def _pesos_priorizados(n: int) -> np.ndarray:
+    """Mismo peso que match_lista(es_priorizada=True): 10·(n-i)."""
+    return 10 * np.arange(n, 0, -1, dtype=np.int64)
+
+def _display_lista(lista: list, hits: np.ndarray) -> list:
+    return [
+        ", ".join(f"✅ {item}" if h else item for item, h in zip(lista, fila))
+        for fila in hits
+    ]
+
+def _puntos_sueldo_vec(vals, rmin, rmax, prio):
+    # Mismo orden de ramas que match_sueldo: "bajo" (< rmin) gana sobre
+    # "sobre rango" aunque el perfil tenga renta_min > renta_max.
+    conocido = ~np.isnan(vals)
+    pts = np.where((vals > rmax) & (vals >= rmin), 10 * prio, 0)
+    pts = np.where((vals >= rmin) & (vals <= rmax), 50 * prio, pts)
+    return np.where(conocido, pts, 0).astype(np.int64)
+
+def _puntos_experiencia_vec(vals, emin, emax, prio):
+    conocido = ~np.isnan(vals)
+    v = np.nan_to_num(vals)
+    diff = np.where(v < emin, np.abs(v - emin), np.abs(v - emax))
+    pts = np.where((v >= emin) & (v <= emax), 20 * prio, np.maximum(0, 20 * prio - diff * 5))
+    return np.where(conocido, pts, 0).astype(np.int64)
+
+def _texto_sueldo(val, rmin, rmax):
+    if np.isnan(val):
+        return match_sueldo(None, rmin, rmax, 0)[1]
+    return match_sueldo(int(val), rmin, rmax, 0)[1]
+
+def _texto_experiencia(val, emin, emax):
+    if np.isnan(val):
+        return match_experiencia(None, emin, emax, 0)[1]
+    return match_experiencia(int(val), emin, emax, 0)[1]
+
+def construir_matriz(df: pd.DataFrame, perfil: dict) -> MatrizOfertas:
+    ofertas = df.to_dict("records") if isinstance(df, pd.DataFrame) else list(df)
+    return MatrizOfertas(ofertas, obtener_motor(perfil))
+
+def calcular_match_batch(df: pd.DataFrame, perfil: dict, matriz: MatrizOfertas = None) -> pd.DataFrame:
+    """
+    Equivalente vectorizado de `[calcular_match(o, perfil) for o in ofertas]`;
+    `df` puede ser un DataFrame de ofertas o directamente la lista.
+    Devuelve un DataFrame con las mismas columnas que calcular_match. Si se pasa
+    una `matriz` ya construida, no se escanea ningún texto: solo se recalculan
+    los pesos.
+    """
+    if matriz is None:
+        matriz = construir_matriz(df, perfil)
+    ofertas = matriz.ofertas
+    cargos, skills, beneficios = perfil.get("cargos", []), perfil["skills"], perfil["beneficios"]
+
+    m_c  = matriz.matriz(matriz.cargos, cargos)
+    m_sk = matriz.matriz(matriz.terminos, skills)
+    m_b  = matriz.matriz(matriz.terminos, beneficios)
+
+    hay_cargo = m_c.any(axis=1)
+    primero   = m_c.argmax(axis=1) if cargos else np.zeros(len(matriz), dtype=np.int64)
+    pts_c  = np.where(hay_cargo, 10 * (len(cargos) - primero) * perfil.get("prioridad_cargos", 9) // 5, 0)
+    pts_sk = (m_sk.astype(np.int64) @ _pesos_priorizados(len(skills))) * perfil["prioridad_skills"] // 5
+    pts_b  = (m_b.astype(np.int64) @ _pesos_priorizados(len(beneficios))) * perfil["prioridad_beneficios"] // 5
+    pts_s  = _puntos_sueldo_vec(matriz.sueldo, perfil["renta_min"], perfil["renta_max"], perfil["prioridad_sueldo"])
+    pts_e  = _puntos_experiencia_vec(
+        matriz.experiencia, perfil["experiencia_min"], perfil["experiencia_max"], perfil["prioridad_experiencia"]
+    )
+    total = (pts_c + pts_sk + pts_s + pts_e + pts_b).astype(np.int64)
+
+    nombres = [o.get("nombre", "") for o in ofertas]
+    res = pd.DataFrame({
+        "Puntaje":     total,
+        "Nombre":      [f"✅ {n}" if h else n for n, h in zip(nombres, hay_cargo)],
+        "Empresa":     [o.get("empresa", "") for o in ofertas],
+        "URL":         [o.get("url", "#") for o in ofertas],
+        "Sueldo":      [_texto_sueldo(v, perfil["renta_min"], perfil["renta_max"]) for v in matriz.sueldo],
+        "Skills":      _display_lista(skills, m_sk),
+        "Experiencia": [_texto_experiencia(v, perfil["experiencia_min"], perfil["experiencia_max"])
+                        for v in matriz.experiencia],
+        "Beneficios":  _display_lista(beneficios, m_b),
+        "Descripcion": [o.get("desc", "") for o in ofertas],
+    })
+    log.debug(f"Match por lote: {len(res)} ofertas puntuadas.")
+    return res
+
+
+# ── Pipeline scrape → score → persistencia ─────────────────
+class PipelineMatch:
+    """
+    Etapa de scoring en streaming: los scrapers le pasan ofertas a medida que
+    llegan, cada micro-lote se puntúa con su propia MatrizOfertas (que después
+    se anexa a la global) y el store se actualiza cada `lote_persistencia`
+    ofertas. `on_resultados(resultados)` recibe la lista acumulada tras cada
+    micro-lote, para refrescar la tabla sin esperar al scrape completo.
+    """
+
+    def __init__(self, perfil: dict, lote_persistencia: int = 25, on_resultados=None,
+                 matriz: MatrizOfertas = None, resultados: list = None):
+        self.perfil        = perfil
+        self.motor         = obtener_motor(perfil)
+        self.matriz        = matriz
+        self.resultados    = list(resultados or [])
+        self.lote          = lote_persistencia
+        self.on_resultados = on_resultados
+        self._pendientes   = ([], [])
+        self.t0            = time.perf_counter()
+        self.t_primero     = None
+        if matriz is not None:
+            matriz.sincronizar(perfil)
+
+    @property
+    def ofertas(self) -> list:
+        return self.matriz.ofertas if self.matriz is not None else []
+
+    def procesar(self, ofertas: list) -> list:
+        """Puntúa un micro-lote, lo anexa y persiste si se juntaron suficientes."""
+        if not ofertas:
+            return []
+        lote = MatrizOfertas(list(ofertas), self.motor)
+        res  = calcular_match_batch(None, self.perfil, lote).to_dict("records")
+        if self.matriz is None:
+            self.matriz = lote
+        else:
+            self.matriz.extender(lote)
+        self.resultados.extend(res)
+        if self.t_primero is None:
+            self.t_primero = time.perf_counter() - self.t0
+        self._pendientes[0].extend(ofertas)
+        self._pendientes[1].extend(res)
+        if len(self._pendientes[0]) >= self.lote:
+            self._persistir()
+        if self.on_resultados:
+            self.on_resultados(self.resultados)
+        return res
+
+    def _persistir(self):
+        ofertas, res = self._pendientes
+        if ofertas:
+            guardar_ofertas_json(ofertas, res)
+            self._pendientes = ([], [])
+
+    def cerrar(self) -> list:
+        """Persiste lo pendiente y baja el cache de extracción. Devuelve todos los resultados."""
+        self._persistir()
+        cache_extraccion().guardar()
+        if self.t_primero is not None:
+            log.info(
+                f"Pipeline: {len(self.resultados)} ofertas · primer resultado a los "
+                f"{self.t_primero:.1f}s · total {time.perf_counter() - self.t0:.1f}s"
+            )
+        return self.resultados
+
+
+# ─────────────────────────────────────────────
+# 6. ANÁLISIS DE INDUSTRIA
+# ─────────────────────────────────────────────
+SKILLS_CONOCIDAS = [
+    "python", "javascript", "typescript", "java", "c#", "go", "rust", "php", "ruby", "scala",
+    "sql", "postgresql", "mysql", "mongodb", "redis", "elasticsearch",
+    "react", "angular", "vue", "next.js", "node.js", "django", "flask", "fastapi",
+    "spring", "express", "laravel",
+    "docker", "kubernetes", "aws", "gcp", "azure", "google cloud", "terraform", "ansible",
+    "git", "ci/cd", "jenkins", "github actions",
+    "machine learning", "data science", "pandas", "spark", "kafka", "airflow",
+    "rest api", "graphql", "microservices", "scrum", "agile", "jira",
+]
+
+# Features de industria por oferta (skills conocidas presentes + sueldo),
+# indexadas por (nombre, desc): una oferta se escanea una sola vez aunque el
+# conjunto cambie entre búsquedas. FIFO acotado, como el cache de extracción.
+_FEATURES_INDUSTRIA = OrderedDict()
+_FEATURES_INDUSTRIA_MAX = 200_000
+
+# Resultados por huella del conjunto de ofertas: los reruns de Streamlit con
+# las mismas ofertas solo pagan la huella, sin volver a escanear skills ni sueldos.
+_CACHE_INDUSTRIA = OrderedDict()
+_CACHE_INDUSTRIA_MAX = 4
+
+def huella_ofertas(ofertas: list) -> str:
+    """
+    Huella del conjunto (url, nombre, empresa, desc): blake2b de 128 bits,
+    como las claves de CacheExtraccion. Es la única clave del cache, así que
+    no puede ser un hash() de 64 bits con sal por proceso.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for o in ofertas:
+        for campo in (o.get("url"), o.get("nombre"), o.get("empresa"), o.get("desc")):
+            h.update(("" if campo is None else str(campo)).encode("utf-8"))
+            h.update(b"\x1f")
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+def _features_industria(nombre: str, desc: str) -> tuple:
+    clave = (nombre, desc)
+    f = _FEATURES_INDUSTRIA.get(clave)
+    if f is None:
+        texto = (nombre + " " + desc).lower()
+        # 50 búsquedas de substring en C siguen siendo más rápidas que una
+        # regex combinada en `re` (medido con `benchmark.py industria`).
+        skills = tuple(sk for sk in SKILLS_CONOCIDAS if sk in texto)
+        # Si el scoring ya extrajo esta descripción se reusa; si no, solo el
+        # sueldo (la experiencia no se usa acá).
+        previo = cache_extraccion().consultar(desc)
+        f = _FEATURES_INDUSTRIA[clave] = (skills, previo[0] if previo else extraer_sueldo(desc))
+        if len(_FEATURES_INDUSTRIA) > _FEATURES_INDUSTRIA_MAX:
+            _FEATURES_INDUSTRIA.popitem(last=False)
+    return f
+
+def analizar_industria(ofertas: list) -> dict:
+    """
+    Skills, cargos, empresas y sueldos del conjunto. Devuelve una copia: el
+    resultado cacheado no se comparte con quien llama.
+    """
+    huella = huella_ofertas(ofertas)
+    if huella in _CACHE_INDUSTRIA:
+        _CACHE_INDUSTRIA.move_to_end(huella)
+        return copy.deepcopy(_CACHE_INDUSTRIA[huella])
+
+    skill_counter   = Counter()
+    cargo_counter   = Counter(o.get("nombre", "Desconocido") for o in ofertas)
+    empresa_counter = Counter(
+        e for e in (o.get("empresa", "Desconocida") for o in ofertas) if e not in ("Desconocida", "")
+    )
+    sueldos         = []
+
+    for o in ofertas:
+        skills, s = _features_industria(o.get("nombre", ""), o.get("desc", ""))
+        skill_counter.update(skills)
+        if s:
+            sueldos.append(s)
+
+    analisis = {
+        "skills":         skill_counter.most_common(20),
+        "cargos":         cargo_counter.most_common(15),
+        "empresas":       empresa_counter.most_common(10),
+        "pct_con_sueldo": round(len(sueldos) / len(ofertas) * 100, 1) if ofertas else 0,
+        "sueldo_promedio":int(sum(sueldos) / len(sueldos)) if sueldos else None,
+        "sueldo_max":     max(sueldos) if sueldos else None,
+        "sueldo_min":     min(sueldos) if sueldos else None,
+    }
+    _CACHE_INDUSTRIA[huella] = analisis
+    if len(_CACHE_INDUSTRIA) > _CACHE_INDUSTRIA_MAX:
+        _CACHE_INDUSTRIA.popitem(last=False)
+    return copy.deepcopy(analisis)
@@ -0,0 +1,1254 @@
+"""
+Scraper de Google Jobs con Selenium: pool de Chrome, cosecha estructurada de
+la página de resultados y extracción consolidada del panel de cada oferta.
+"""
+import atexit
+import hashlib
+import html as html_lib
+import json
+import os
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import quote_plus
+
+from bs4 import BeautifulSoup
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from webdriver_manager.chrome import ChromeDriverManager
+
+from config import GOOGLE_LOTE, log, recurso_proceso
+from storage import agregar_si_nueva
+
+
+# ─────────────────────────────────────────────
+# 11. GOOGLE JOBS SCRAPER — TODOS LOS BLOQUES
+# ─────────────────────────────────────────────
+
+def _js(driver, script, *args):
+    """Shortcut para execute_script."""
+    return driver.execute_script(script, *args)
+
+
+# ── Esperas por eventos (en vez de sleeps fijos) ───────────
+class TiemposPasos:
+    """Acumula cuánto tarda cada paso/espera del pipeline para ver cuáles son lentos."""
+
+    def __init__(self):
+        self.pasos   = {}
+        self.conteos = {}
+
+    @contextmanager
+    def medir(self, paso: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.pasos.setdefault(paso, []).append(time.perf_counter() - t0)
+
+    def contar(self, clave: str, n: int):
+        self.conteos.setdefault(clave, []).append(n)
+
+    def fusionar(self, otro: "TiemposPasos"):
+        for paso, tiempos in otro.pasos.items():
+            self.pasos.setdefault(paso, []).extend(tiempos)
+        for clave, ns in otro.conteos.items():
+            self.conteos.setdefault(clave, []).extend(ns)
+
+    def resumen(self) -> str:
+        partes = [
+            f"{paso} {sum(t) / len(t):.2f}s (máx {max(t):.2f}s)" for paso, t in self.pasos.items() if t
+        ]
+        partes += [f"{clave} {sum(n) / len(n):.1f}" for clave, n in self.conteos.items() if n]
+        return " · ".join(partes)
+
+
+class ContadorRoundTrips:
+    """
+    Cuenta los comandos WebDriver (cada uno es un round-trip HTTP al driver).
+    Envuelve `driver.execute`, por donde pasan también los métodos de WebElement.
+    """
+
+    def __init__(self, driver):
+        self.n = 0
+        original = driver.execute
+
+        def _execute(*args, **kwargs):
+            self.n += 1
+            return original(*args, **kwargs)
+
+        driver.execute = _execute
+
+
+# MutationObserver sobre #Sva75c: resuelve cuando el panel tiene texto y lleva
+# `quietoMs` sin mutaciones (el render del job terminó). Con `requiereCambio`
+# además exige al menos una mutación (p.ej. tras expandir la descripción).
+_JS_PANEL_ESTABLE = """
+    const [minLen, quietoMs, timeoutMs, requiereCambio] = arguments;
+    const done = arguments[arguments.length - 1];
+    const t0 = performance.now();
+    const panel = document.getElementById('Sva75c');
+    if (!panel) { done({ok: false, motivo: 'NO_PANEL', ms: 0}); return; }
+    let ultimo = t0, cambios = 0;
+    const obs = new MutationObserver(() => { ultimo = performance.now(); cambios++; });
+    obs.observe(panel, {childList: true, subtree: true, characterData: true});
+    const tick = () => {
+        const ahora = performance.now();
+        const len = (panel.innerText || '').length;
+        const listo = len >= minLen && ahora - ultimo >= quietoMs && (!requiereCambio || cambios > 0);
+        if (listo || ahora - t0 > timeoutMs) {
+            obs.disconnect();
+            done({ok: listo, motivo: listo ? 'OK' : 'TIMEOUT', len: len, cambios: cambios, ms: ahora - t0});
+            return;
+        }
+        setTimeout(tick, 50);
+    };
+    tick();
+"""
+
+def _esperar_panel_estable(driver, min_len=80, quieto_ms=300, timeout=6.0, requiere_cambio=False) -> dict:
+    """
+    Espera (en el contexto del panel, doc principal o iframe) a que #Sva75c
+    termine de renderizar. Si el panel todavía no existe, reintenta hasta que
+    aparezca o se agote `timeout`.
+    """
+    limite = time.monotonic() + timeout
+    while True:
+        # El script se resuelve solo a los `timeoutMs`, dentro del script timeout
+        # fijo del driver (GOOGLE_TIMEOUT_JOB + 5, ver _crear_driver): no hace
+        # falta tocarlo, así la espera no suma round-trips al conteo legacy.
+        restante = min(max(0.1, limite - time.monotonic()), GOOGLE_TIMEOUT_JOB)
+        try:
+            _en_frame_panel(driver)
+            res = driver.execute_async_script(
+                _JS_PANEL_ESTABLE, min_len, quieto_ms, int(restante * 1000), requiere_cambio
+            ) or {}
+        except Exception as e:
+            res = {"ok": False, "motivo": f"ERR: {e}"}
+        finally:
+            driver.switch_to.default_content()
+        if res.get("motivo") != "NO_PANEL" or time.monotonic() >= limite:
+            return res
+        time.sleep(0.1)
+
+def _esperar_url_job(driver, url_antes, timeout=8.0):
+    """Espera a que la URL pase a otro `#vhid=`/`#sv=` (el job clickeado). None si no cambia."""
+    def _cambio(d):
+        u = d.current_url
+        return u if ("#vhid=" in u or "#sv=" in u) and u != url_antes else False
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=0.1).until(_cambio)
+    except TimeoutException:
+        return None
+
+
+def _click_bloque(driver, bloque, idx):
+    """
+    Hace click en el bloque de trabajo para abrir el panel derecho.
+    Google Jobs usa jsaction para manejar clicks — hay que disparar
+    el evento en el elemento hijo con jsaction, no en el contenedor div.EimVGf.
+    Retorna (titulo_texto, exito).
+    """
+    titulo_texto = f"Oferta #{idx+1}"
+
+    # Leer título via innerText del bloque completo
+    try:
+        inner = _js(driver, "return arguments[0].innerText;", bloque) or ""
+        lineas = [l.strip() for l in inner.splitlines() if l.strip()]
+        for linea in lineas:
+            if not any(p in linea.lower() for p in ["hace ", "hours ago", "days ago", "day ago", "clp", "usd", "a través"]):
+                if len(linea) > 3:
+                    titulo_texto = linea
+                    break
+        print(f"   Título del bloque: '{titulo_texto}'")
+    except Exception as e:
+        print(f"   ⚠️ No se pudo leer innerText: {e}")
+
+    # Scroll al bloque
+    try:
+        _js(driver, "arguments[0].scrollIntoView({block:'center'});", bloque)
+    except Exception:
+        pass
+
+    # Estrategia 1: click en el hijo con jsaction dentro del bloque
+    # Google Jobs usa jsaction="focus:..." o jsaction="click:..." en el elemento real
+    resultado = _js(driver, """
+        const bloque = arguments[0];
+        // Buscar hijo con jsaction (el elemento que recibe el evento real)
+        const conJsaction = bloque.querySelector('[jsaction]');
+        if (conJsaction) {
+            conJsaction.dispatchEvent(new MouseEvent('click', {bubbles: true, cancelable: true}));
+            return 'OK:jsaction:' + (conJsaction.getAttribute('jsaction') || '');
+        }
+        // Fallback: click nativo en el bloque
+        bloque.dispatchEvent(new MouseEvent('click', {bubbles: true, cancelable: true}));
+        return 'OK:bloque';
+    """, bloque)
+
+    print(f"   Click resultado: '{resultado}'")
+    if resultado and resultado.startswith("OK:"):
+        print(f"   ✅ Click OK.")
+        return titulo_texto, True
+
+    print(f"   ❌ Click falló.")
+    return titulo_texto, False
+
+
+def _get_panel_frame(driver):
+    """
+    El panel de detalle de Google Jobs vive en un iframe.
+    Devuelve el iframe que contiene #Sva75c, o None si no existe.
+    """
+    try:
+        frames = driver.find_elements(By.TAG_NAME, "iframe")
+        for frame in frames:
+            try:
+                driver.switch_to.frame(frame)
+                panel = driver.find_elements(By.ID, "Sva75c")
+                if panel:
+                    return True  # ya estamos en el frame correcto
+                driver.switch_to.default_content()
+            except Exception:
+                driver.switch_to.default_content()
+        return False
+    except Exception:
+        return False
+
+
+def _en_frame_panel(driver):
+    """
+    Cambia al iframe que contiene el panel de descripción.
+    Devuelve True si lo encontró, False si el panel está en el doc principal.
+    """
+    driver.switch_to.default_content()
+
+    # Primero verificar si #Sva75c está en el documento principal
+    panel_principal = _js(driver, "return !!document.getElementById('Sva75c');")
+    if panel_principal:
+        return True  # ya estamos en el contexto correcto
+
+    # Buscar en iframes
+    frames = driver.find_elements(By.TAG_NAME, "iframe")
+    for frame in frames:
+        try:
+            driver.switch_to.frame(frame)
+            panel = driver.execute_script("return !!document.getElementById('Sva75c');")
+            if panel:
+                return True
+            driver.switch_to.default_content()
+        except Exception:
+            driver.switch_to.default_content()
+
+    return False  # no encontrado en ningún contexto
+
+
+def _click_mostrar_descripcion(driver):
+    """
+    Clickea 'Mostrar descripción completa'.
+    El HTML tiene dos niveles:
+      - div[jsname="G7vtgf"]  ← contenedor externo (jsaction registrado aquí)
+      - div[role="button"]    ← hijo interno (elemento visual clickeable)
+    Estrategia: localizar el role=button correcto vía texto, luego intentar
+    click nativo de Selenium + dispatchEvent en ambos niveles como fallback.
+    """
+    print("   🔍 [3/4] Buscando botón 'Mostrar/Ver descripción completa'...")
+
+    # JS: devuelve el XPath del botón correcto para que Selenium haga click nativo
+    js_find = """
+        // Estrategia A: role=button dentro del wrapper jsname=G7vtgf
+        const wrapper = document.querySelector('[jsname="G7vtgf"]');
+        if (wrapper) {
+            const rb = wrapper.querySelector('[role="button"]');
+            if (rb) return 'FOUND_INNER';
+        }
+        // Estrategia B: cualquier role=button cuyo texto mencione "descripci"
+        const allBtns = document.querySelectorAll('[role="button"]');
+        for (const b of allBtns) {
+            const t = (b.textContent || '').trim().toLowerCase();
+            if (t.includes('descripci') || t.includes('description')) {
+                return 'FOUND_TEXT';
+            }
+        }
+        // Estrategia C: jsaction directo
+        const jsact = document.querySelector('[jsaction*="EMtXr"]');
+        if (jsact) return 'FOUND_JSACT';
+        return 'NOT_FOUND';
+    """
+
+    js_click_all = """
+        let targets = [];
+
+        // Nivel 1: role=button dentro de jsname=G7vtgf
+        const wrapper = document.querySelector('[jsname="G7vtgf"]');
+        if (wrapper) {
+            const rb = wrapper.querySelector('[role="button"]');
+            if (rb) targets.push({el: rb, label: 'inner-role-button'});
+            targets.push({el: wrapper, label: 'jsname-wrapper'});
+        }
+
+        // Nivel 2: jsaction directo
+        const jsact = document.querySelector('[jsaction*="EMtXr"]');
+        if (jsact && !targets.find(t => t.el === jsact)) {
+            targets.push({el: jsact, label: 'jsaction'});
+        }
+
+        // Nivel 3: role=button con texto de descripción
+        const allBtns = document.querySelectorAll('[role="button"]');
+        for (const b of allBtns) {
+            const t = (b.textContent || '').trim().toLowerCase();
+            if ((t.includes('descripci') || t.includes('description')) && !targets.find(x => x.el === b)) {
+                targets.push({el: b, label: 'text-match'});
+            }
+        }
+
+        if (targets.length === 0) return 'NOT_FOUND';
+
+        const results = [];
+        for (const {el, label} of targets) {
+            try {
+                el.scrollIntoView({block: 'center', behavior: 'instant'});
+                // dispatchEvent con todos los eventos necesarios para Google
+                ['mousedown','mouseup','click'].forEach(evt => {
+                    el.dispatchEvent(new MouseEvent(evt, {bubbles: true, cancelable: true, view: window}));
+                });
+                results.push('OK:' + label);
+            } catch(e) {
+                results.push('ERR:' + label + ':' + e.message);
+            }
+        }
+        return results.join('|');
+    """
+
+    def _intentar_en_contexto(ctx_label):
+        # Verificar si el botón existe
+        resultado_find = _js(driver, js_find)
+        print(f"   {ctx_label} → find: '{resultado_find}'")
+        if resultado_find == 'NOT_FOUND':
+            return False, 'NOT_FOUND'
+
+        # Intentar click vía JS (dispatchEvent en todos los niveles)
+        resultado_js = _js(driver, js_click_all)
+        print(f"   {ctx_label} → js_click: '{resultado_js}'")
+
+        # Intentar adicionalmente click nativo de Selenium en el elemento
+        try:
+            # Buscar primero el role=button dentro del wrapper
+            selectors = [
+                '[jsname="G7vtgf"] [role="button"]',
+                '[jsaction*="EMtXr"] [role="button"]',
+                '[jsaction*="EMtXr"]',
+                '[jsname="G7vtgf"]',
+            ]
+            for sel in selectors:
+                elements = driver.find_elements(By.CSS_SELECTOR, sel)
+                for el in elements:
+                    txt = (el.text or '').lower()
+                    # Filtrar solo el botón de descripción (puede haber otros role=button)
+                    if sel in ('[jsname="G7vtgf"] [role="button"]', '[jsaction*="EMtXr"] [role="button"]') or \
+                       'descripci' in txt or 'description' in txt or el.get_attribute('jsname') == 'G7vtgf':
+                        try:
+                            from selenium.webdriver.common.action_chains import ActionChains
+                            ActionChains(driver).move_to_element(el).click().perform()
+                            print(f"   {ctx_label} → native click OK en '{sel}'")
+                            return True, 'native:' + sel
+                        except Exception as e_nat:
+                            print(f"   {ctx_label} → native click ERR en '{sel}': {e_nat}")
+        except Exception as e:
+            print(f"   {ctx_label} → selenium search ERR: {e}")
+
+        # Si al menos el JS click no dio NOT_FOUND, considerarlo exitoso
+        if resultado_js and 'OK:' in resultado_js:
+            return True, resultado_js
+        return False, resultado_js
+
+    # ── Intentar en documento principal ──
+    driver.switch_to.default_content()
+    ok, info = _intentar_en_contexto("Doc principal")
+    if ok:
+        print(f"   ✅ Descripción expandida ({info})")
+        driver.switch_to.default_content()
+        return True
+
+    # ── Intentar en cada iframe ──
+    frames = driver.find_elements(By.TAG_NAME, "iframe")
+    print(f"   Probando {len(frames)} iframe(s)...")
+    for i, frame in enumerate(frames):
+        try:
+            driver.switch_to.frame(frame)
+            ok, info = _intentar_en_contexto(f"iframe[{i}]")
+            if ok:
+                print(f"   ✅ Descripción expandida en iframe[{i}] ({info})")
+                driver.switch_to.default_content()
+                return True
+            driver.switch_to.default_content()
+        except Exception as e:
+            print(f"   iframe[{i}] error accediendo: {e}")
+            driver.switch_to.default_content()
+
+    driver.switch_to.default_content()
+    print("   ⚠️ Botón no encontrado en ningún contexto (descripción puede ya estar completa)")
+    return False
+
+
+def _extraer_descripcion(driver):
+    """
+    Extrae el texto de la descripción del panel derecho.
+    Busca en documento principal Y en iframes.
+    Busca el div con más texto dentro de #Sva75c.
+    """
+    print("   🔍 [4/4] Extrayendo texto de descripción...")
+
+    js_extraer = """
+        const panel = document.getElementById('Sva75c');
+        if (!panel) return JSON.stringify({ok: false, fuente: 'NO_PANEL', texto: ''});
+
+        const divs = panel.querySelectorAll('div');
+        let mejor = '';
+        for (const d of divs) {
+            if (d.children.length > 20) continue;
+            const t = (d.innerText || '').trim();
+            if (t.length > mejor.length && t.length < 30000) {
+                mejor = t;
+            }
+        }
+        return JSON.stringify({ok: mejor.length > 80, fuente: 'Sva75c', texto: mejor});
+    """
+
+    # Intentar en documento principal
+    driver.switch_to.default_content()
+    raw = _js(driver, js_extraer)
+
+    try:
+        data = json.loads(raw)
+    except Exception:
+        data = {"ok": False, "fuente": "parse_error", "texto": ""}
+
+    if not data.get("ok"):
+        print(f"   ↳ Doc principal: fuente={data.get('fuente')} — buscando en iframes...")
+        frames = driver.find_elements(By.TAG_NAME, "iframe")
+        for i, frame in enumerate(frames):
+            try:
+                driver.switch_to.frame(frame)
+                raw2 = driver.execute_script(js_extraer)
+                data2 = json.loads(raw2)
+                print(f"   ↳ iframe[{i}]: fuente={data2.get('fuente')}, len={len(data2.get('texto',''))}")
+                if data2.get("ok"):
+                    data = data2
+                    break
+                driver.switch_to.default_content()
+            except Exception as e:
+                print(f"   ↳ iframe[{i}] error: {e}")
+                driver.switch_to.default_content()
+
+    driver.switch_to.default_content()
+
+    texto = data.get("texto", "")
+    if len(texto) > 80:
+        print(f"   ✅ Descripción OK: {len(texto)} chars | preview: {texto[:120].replace(chr(10),' ')}")
+        return texto
+
+    print(f"   ❌ Sin descripción ({len(texto)} chars)")
+    return ""
+
+
+def _leer_titulo_panel(driver):
+    """Lee el h1/h2/h3 del panel de detalle — busca en doc principal y en iframes."""
+    js = """
+        const raiz = document.getElementById('Sva75c') || document.body;
+        const els = raiz.querySelectorAll('h1, h2, h3');
+        for (const el of els) {
+            const t = (el.innerText || '').trim();
+            if (t.length > 3 && t.length < 120) return t;
+        }
+        return '';
+    """
+    driver.switch_to.default_content()
+    titulo = _js(driver, js) or ""
+    if not titulo:
+        frames = driver.find_elements(By.TAG_NAME, "iframe")
+        for frame in frames:
+            try:
+                driver.switch_to.frame(frame)
+                titulo = driver.execute_script(js) or ""
+                driver.switch_to.default_content()
+                if titulo:
+                    break
+            except Exception:
+                driver.switch_to.default_content()
+    return titulo
+
+
+@recurso_proceso
+def _ruta_chromedriver() -> str:
+    # Resolver/descargar el driver una sola vez por proceso.
+    return ChromeDriverManager().install()
+
+
+def _crear_driver(headless: bool = False):
+    chrome_options = Options()
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option("useAutomationExtension", False)
+    if headless:
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--window-size=1400,1000")
+
+    print(f"\n🔧 Iniciando ChromeDriver{' (headless)' if headless else ''}...")
+    service = Service(_ruta_chromedriver())
+    driver  = webdriver.Chrome(service=service, options=chrome_options)
+    driver.execute_cdp_cmd(
+        "Page.addScriptToEvaluateOnNewDocument",
+        {"source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"}
+    )
+    # Fijo por driver: así la extracción consolidada no gasta un round-trip extra en esto.
+    driver.set_script_timeout(GOOGLE_TIMEOUT_JOB + 5)
+    driver.round_trips = ContadorRoundTrips(driver)
+    return driver
+
+
+class DriverPool:
+    """
+    Pool de Chrome a nivel de proceso (vive en `recurso_proceso`, sobrevive
+    a los reruns). Cada driver recuerda qué búsqueda tiene cargada, así "Ver más"
+    sigue sobre la misma página sin volver a navegar. Los drivers se descartan
+    si fallan el health check, si quedan ociosos más de `idle_timeout`
+    segundos o tras `max_paginas` navegaciones (Chrome acumula memoria).
+    """
+
+    class Entrada:
+        def __init__(self, driver, headless):
+            self.driver      = driver
+            self.headless    = headless
+            self.paginas     = 0
+            self.url_cargada = None
+            self.ultimo_uso  = time.monotonic()
+
+    def __init__(self, max_drivers: int = 6, idle_timeout: float = 300, max_paginas: int = 40):
+        self.max_drivers  = max_drivers
+        self.idle_timeout = idle_timeout
+        self.max_paginas  = max_paginas
+        self._libres  = []
+        self._en_uso  = 0
+        self._cond    = threading.Condition()
+        threading.Thread(target=self._reaper, daemon=True).start()
+        atexit.register(self.cerrar_todo)
+
+    @staticmethod
+    def _sano(entrada) -> bool:
+        try:
+            entrada.driver.execute_script("return 1;")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _cerrar(entrada):
+        try:
+            entrada.driver.quit()
+        except Exception:
+            pass
+
+    def adquirir(self, headless: bool, url: str = None):
+        """
+        Devuelve un driver libre, prefiriendo uno con `url` ya cargada. Si no hay
+        libres y se alcanzó el máximo, espera a que se libere uno. El health
+        check, el quit y el arranque de Chrome corren fuera del lock (pueden
+        tardar segundos); mientras, el cupo queda reservado en `_en_uso`.
+        """
+        while True:
+            entrada = descartar = None
+            with self._cond:
+                while True:
+                    candidatos = [e for e in self._libres if e.headless == headless]
+                    lleno = self._en_uso + len(self._libres) >= self.max_drivers
+                    if candidatos:
+                        entrada = min(candidatos, key=lambda e: e.url_cargada != url)
+                        self._libres.remove(entrada)
+                    elif lleno and self._libres:
+                        # Hay libres pero con otro modo (headless/visible): liberar cupo.
+                        descartar = self._libres.pop(0)
+                    elif lleno:
+                        self._cond.wait()
+                        continue
+                    self._en_uso += 1
+                    break
+            if descartar is not None:
+                self._cerrar(descartar)
+            if entrada is None:
+                break
+            if self._sano(entrada):
+                return entrada
+            self._cerrar(entrada)
+            with self._cond:
+                self._en_uso -= 1
+                self._cond.notify()
+        try:
+            return self.Entrada(_crear_driver(headless), headless)
+        except Exception:
+            with self._cond:
+                self._en_uso -= 1
+                self._cond.notify()
+            raise
+
+    def liberar(self, entrada, sano: bool = True):
+        entrada.ultimo_uso = time.monotonic()
+        reciclar = not sano or entrada.paginas >= self.max_paginas
+        if reciclar:
+            # Se cierra antes de devolver el cupo, así nunca hay más de max_drivers Chrome vivos.
+            print(f"♻️ Reciclando driver ({entrada.paginas} páginas).")
+            self._cerrar(entrada)
+        with self._cond:
+            self._en_uso -= 1
+            if not reciclar:
+                self._libres.append(entrada)
+            self._cond.notify()
+
+    def _reaper(self):
+        while True:
+            time.sleep(30)
+            limite = time.monotonic() - self.idle_timeout
+            with self._cond:
+                vencidos = [e for e in self._libres if e.ultimo_uso < limite]
+                for e in vencidos:
+                    self._libres.remove(e)
+            for e in vencidos:
+                print("🔒 Cerrando driver ocioso.")
+                self._cerrar(e)
+
+    def cerrar_todo(self):
+        with self._cond:
+            libres, self._libres = self._libres, []
+        for e in libres:
+            self._cerrar(e)
+
+
+@recurso_proceso
+def obtener_pool_drivers() -> DriverPool:
+    return DriverPool()
+
+
+def _url_google_jobs(query, ubicacion):
+    full_query = f"{query} {ubicacion}"
+    return f"https://www.google.com/search?q={quote_plus(full_query)}&ibp=htl;jobs"
+
+
+def _cargar_bloques(driver, url) -> int:
+    """Navega a la búsqueda y devuelve cuántos div.EimVGf hay. Lanza TimeoutException si no aparecen."""
+    print(f"\n🌐 Navegando a: {url}")
+    driver.get(url)
+
+    print("\n🔎 Buscando bloques de trabajo (div.EimVGf)...")
+    try:
+        WebDriverWait(driver, 12).until(
+            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.EimVGf"))
+        )
+    except TimeoutException:
+        print("   ❌ Timeout: no aparecieron bloques. Imprimiendo página para diagnóstico...")
+        print(driver.page_source[:2000])
+        raise
+    total = len(driver.find_elements(By.CSS_SELECTOR, "div.EimVGf"))
+    print(f"   ✅ {total} bloques encontrados.")
+    return total
+
+
+def _bloques_cargados(driver) -> int:
+    """Cantidad de div.EimVGf en la página actual del driver (0 si no hay o falla)."""
+    try:
+        driver.switch_to.default_content()
+        return len(driver.find_elements(By.CSS_SELECTOR, "div.EimVGf"))
+    except Exception:
+        return 0
+
+
+# ── Cosecha estructurada (todas las ofertas en una pasada) ──
+# Antes de clickear nada: un único page_source de la página de resultados
+# entrega título/empresa/ubicación/snippet de cada div.EimVGf, y si Google
+# embebe JSON-LD `JobPosting`, también la descripción completa. El panel solo
+# se abre para las ofertas a las que aún les falta la descripción.
+GOOGLE_COSECHA = os.environ.get("DREAMJOB_GOOGLE_COSECHA", "1") != "0"
+
+_EXCLUIR_TITULO  = ("hace ", "hours ago", "days ago", "day ago", "clp", "usd", "a través")
+_RE_VIA          = re.compile(r"^(?:a través de|vía|via)\s+", re.I)
+_RE_PUBLICADO    = re.compile(r"\bhace\s+\d+|\bago\b|^\d+\s*(?:h|d)$", re.I)
+_RE_SUELDO_CHIP  = re.compile(r"\$|\bclp\b|\busd\b|al mes|al año|por hora|salario|sueldo", re.I)
+_RE_TAGS_HTML    = re.compile(r"<(?:br|/p|/li|/div|/h\d)\s*/?>", re.I)
+_RE_TAG          = re.compile(r"<[^>]+>")
+_XP_BLOQUES_G    = '//div[contains(concat(" ", normalize-space(@class), " "), " EimVGf ")]'
+_XP_TEXTO_G      = './/text()[not(ancestor::script) and not(ancestor::style)]'
+
+
+def _norm_titulo(t: str) -> str:
+    return " ".join((t or "").lower().split())
+
+
+def _texto_desde_html(s: str) -> str:
+    """Descripción HTML de un JobPosting → texto plano con saltos de línea."""
+    s = _RE_TAG.sub("", _RE_TAGS_HTML.sub("\n", s or ""))
+    return "\n".join(l.strip() for l in html_lib.unescape(s).splitlines() if l.strip())
+
+
+def _sueldo_jsonld(base) -> str:
+    if not isinstance(base, dict):
+        return ""
+    valor = base.get("value") if isinstance(base.get("value"), dict) else base
+    partes = [str(valor.get(k)) for k in ("minValue", "maxValue", "value") if valor.get(k) not in (None, "")]
+    if not partes:
+        return ""
+    return f"{base.get('currency', '')} {' - '.join(partes)} {valor.get('unitText', '')}".strip()
+
+
+def _job_postings_jsonld(blobs: list) -> list:
+    """Aplana los <script type="application/ld+json"> y devuelve los JobPosting normalizados."""
+    pendientes, salida = [], []
+    for b in blobs:
+        try:
+            pendientes.append(json.loads(b))
+        except (ValueError, TypeError):
+            continue
+    while pendientes:
+        item = pendientes.pop()
+        if isinstance(item, list):
+            pendientes.extend(item)
+            continue
+        if not isinstance(item, dict):
+            continue
+        if "@graph" in item:
+            pendientes.extend(item["@graph"] if isinstance(item["@graph"], list) else [item["@graph"]])
+        tipo = item.get("@type")
+        if tipo != "JobPosting" and not (isinstance(tipo, list) and "JobPosting" in tipo):
+            continue
+        org = item.get("hiringOrganization") or {}
+        lugar = item.get("jobLocation") or {}
+        if isinstance(lugar, list):
+            lugar = lugar[0] if lugar else {}
+        dir_ = (lugar.get("address") or {}) if isinstance(lugar, dict) else {}
+        ubicacion = ", ".join(
+            v for v in (dir_.get("addressLocality"), dir_.get("addressRegion")) if isinstance(v, str) and v
+        ) if isinstance(dir_, dict) else ""
+        salida.append({
+            "titulo":    (item.get("title") or "").strip(),
+            "empresa":   (org.get("name") if isinstance(org, dict) else str(org or "")).strip(),
+            "ubicacion": ubicacion,
+            "desc":      _texto_desde_html(item.get("description", "")),
+            "sueldo":    _sueldo_jsonld(item.get("baseSalary")),
+            "url":       item.get("url") or "",
+        })
+    salida.reverse()
+    return salida
+
+
+def _registro_desde_lineas(lineas: list, idx: int) -> dict:
+    """
+    Interpreta el texto de un div.EimVGf: primero el título, luego empresa y
+    ubicación; aparte quedan el origen ("a través de ..."), la antigüedad y
+    los chips de sueldo. El snippet son todas las líneas.
+    """
+    titulo, resto = f"Oferta #{idx+1}", []
+    for i, l in enumerate(lineas):
+        if len(l) > 3 and not any(p in l.lower() for p in _EXCLUIR_TITULO):
+            titulo, resto = l, lineas[i+1:]
+            break
+    meta, sueldos = [], []
+    for l in resto:
+        for parte in re.split(r"\s+[•·]\s+", l):
+            if _RE_VIA.match(parte) or _RE_PUBLICADO.search(parte):
+                continue
+            if _RE_SUELDO_CHIP.search(parte):
+                sueldos.append(parte)
+            elif len(parte) < 80:
+                meta.append(parte)
+    return {
+        "titulo":    titulo,
+        "empresa":   meta[0] if meta else "",
+        "ubicacion": meta[1] if len(meta) > 1 else "",
+        "sueldo":    " · ".join(sueldos),
+        "snippet":   "\n".join(lineas),
+        "desc":      "",
+        "url":       "",
+    }
+
+
+def _parsear_resultados_google(html: str):
+    """page_source → (líneas de texto de cada bloque, blobs JSON-LD). lxml si está, si no bs4."""
+    if lxml_html is not None:
+        doc = lxml_html.fromstring(html)
+        bloques = [
+            [t.strip() for t in b.xpath(_XP_TEXTO_G) if t.strip()]
+            for b in doc.xpath(_XP_BLOQUES_G)
+        ]
+        blobs = doc.xpath('//script[@type="application/ld+json"]/text()')
+        return bloques, blobs
+    soup = BeautifulSoup(html, "html.parser")
+    bloques = []
+    for b in soup.select("div.EimVGf"):
+        for s in b.select("script, style"):
+            s.decompose()
+        bloques.append([t.strip() for t in b.get_text("\n").splitlines() if t.strip()])
+    blobs = [s.string or "" for s in soup.select('script[type="application/ld+json"]')]
+    return bloques, blobs
+
+
+def _cosechar_resultados(driver) -> list:
+    """
+    Un registro por div.EimVGf (mismo orden que los índices de bloque) a partir
+    de un único page_source. Los JobPosting JSON-LD se cruzan por título
+    (y empresa si hay varios con el mismo título) y aportan descripción y URL.
+    """
+    driver.switch_to.default_content()
+    bloques, blobs = _parsear_resultados_google(driver.page_source)
+    registros = [_registro_desde_lineas(lineas, i) for i, lineas in enumerate(bloques)]
+
+    por_titulo = {}
+    for jp in _job_postings_jsonld(blobs):
+        por_titulo.setdefault(_norm_titulo(jp["titulo"]), []).append(jp)
+    for reg in registros:
+        candidatos = por_titulo.get(_norm_titulo(reg["titulo"]))
+        if not candidatos:
+            continue
+        jp = next((c for c in candidatos if _norm_titulo(c["empresa"]) == _norm_titulo(reg["empresa"])), candidatos[0])
+        candidatos.remove(jp)
+        reg["empresa"]   = reg["empresa"] or jp["empresa"]
+        reg["ubicacion"] = reg["ubicacion"] or jp["ubicacion"]
+        reg["sueldo"]    = reg["sueldo"] or jp["sueldo"]
+        reg["desc"], reg["url"] = jp["desc"], jp["url"]
+    con_desc = sum(1 for r in registros if r["desc"])
+    print(f"   🌾 Cosecha: {len(registros)} bloques, {len(blobs)} JSON-LD, {con_desc} con descripción completa.")
+    return registros
+
+
+def _oferta_desde_registro(reg: dict, url_busqueda: str) -> dict:
+    """Oferta armada solo con la cosecha (sin abrir el panel)."""
+    desc = reg["desc"] or reg["snippet"]
+    if reg["sueldo"] and reg["sueldo"] not in desc:
+        desc += "\n" + reg["sueldo"]
+    url = reg["url"]
+    if not url:
+        # Sin #vhid= (no se abrió el panel): id estable por título/empresa/ubicación.
+        clave = f"{reg['titulo']}|{reg['empresa']}|{reg['ubicacion']}".lower()
+        url = f"{url_busqueda}#dj={hashlib.blake2b(clave.encode('utf-8'), digest_size=8).hexdigest()}"
+    return {"nombre": reg["titulo"], "empresa": reg["empresa"], "desc": desc, "url": url}
+
+
+# ── Extracción consolidada (1 round-trip por job) ──────────
+# "consolidado": un solo execute_async_script por job; "legacy": el camino
+# paso a paso (click, esperas, expandir, extraer) con varias llamadas por iframe.
+GOOGLE_EXTRACCION  = os.environ.get("DREAMJOB_GOOGLE_EXTRACCION", "consolidado")
+GOOGLE_TIMEOUT_JOB = 20.0
+
+# Corre en el documento principal: clickea el bloque, espera el #vhid= nuevo,
+# ubica el panel (doc principal o iframe same-origin, cacheado en
+# window.__djPanelFrame mientras dure la página), espera a que se estabilice,
+# expande la descripción y devuelve todo en un único payload JSON.
+_JS_JOB_CONSOLIDADO = """
+    const [idx, timeoutMs] = arguments;
+    const done = arguments[arguments.length - 1];
+    const t0 = performance.now();
+    const restante = () => Math.max(0, timeoutMs - (performance.now() - t0));
+
+    const esperar = (cond, ms) => new Promise(res => {
+        const t = performance.now();
+        const f = () => {
+            const v = cond();
+            if (v || performance.now() - t > ms) res(v); else setTimeout(f, 50);
+        };
+        f();
+    });
+    const estable = (raiz, minLen, quietoMs, ms, requiereCambio) => new Promise(res => {
+        const t = performance.now();
+        let ultimo = t, cambios = 0;
+        const obs = new MutationObserver(() => { ultimo = performance.now(); cambios++; });
+        obs.observe(raiz, {childList: true, subtree: true, characterData: true});
+        const f = () => {
+            const ahora = performance.now();
+            const listo = (raiz.innerText || '').length >= minLen && ahora - ultimo >= quietoMs
+                          && (!requiereCambio || cambios > 0);
+            if (listo || ahora - t > ms) { obs.disconnect(); res(listo); } else setTimeout(f, 50);
+        };
+        f();
+    });
+    const docPanel = () => {
+        const frames = document.querySelectorAll('iframe');
+        const enFrame = i => {
+            try { const d = frames[i].contentDocument; return d && d.getElementById('Sva75c') ? d : null; }
+            catch (e) { return null; }
+        };
+        const c = window.__djPanelFrame;
+        if (c === -1 && document.getElementById('Sva75c')) return document;
+        if (c >= 0 && c < frames.length && enFrame(c)) return enFrame(c);
+        if (document.getElementById('Sva75c')) { window.__djPanelFrame = -1; return document; }
+        for (let i = 0; i < frames.length; i++) {
+            if (enFrame(i)) { window.__djPanelFrame = i; return enFrame(i); }
+        }
+        return null;
+    };
+
+    const bloque = document.querySelectorAll('div.EimVGf')[idx];
+    if (!bloque) { done({ok: false, motivo: 'NO_BLOQUE'}); return; }
+    const EXCLUIR = ['hace ', 'hours ago', 'days ago', 'day ago', 'clp', 'usd', 'a través'];
+    let tituloBloque = 'Oferta #' + (idx + 1);
+    for (const l of (bloque.innerText || '').split('\\n').map(s => s.trim()).filter(Boolean)) {
+        if (!EXCLUIR.some(p => l.toLowerCase().includes(p)) && l.length > 3) { tituloBloque = l; break; }
+    }
+
+    (async () => {
+        const urlAntes = location.href;
+        bloque.scrollIntoView({block: 'center'});
+        (bloque.querySelector('[jsaction]') || bloque)
+            .dispatchEvent(new MouseEvent('click', {bubbles: true, cancelable: true}));
+        const url = await esperar(() => {
+            const u = location.href;
+            return (u.includes('#vhid=') || u.includes('#sv=')) && u !== urlAntes ? u : null;
+        }, Math.min(8000, restante()));
+
+        const doc = await esperar(docPanel, Math.min(4000, restante()));
+        if (!doc) { done({ok: false, motivo: 'NO_PANEL', titulo: tituloBloque, url: location.href}); return; }
+        const panel = doc.getElementById('Sva75c');
+        await estable(panel, 80, 300, Math.min(6000, restante()), false);
+
+        const boton = doc.querySelector('[jsname="G7vtgf"] [role="button"]')
+            || doc.querySelector('[jsaction*="EMtXr"]')
+            || [...doc.querySelectorAll('[role="button"]')]
+                   .find(b => /descripci|description/i.test(b.textContent || ''));
+        let expandido = false;
+        if (boton) {
+            boton.scrollIntoView({block: 'center', behavior: 'instant'});
+            ['mousedown', 'mouseup', 'click'].forEach(evt =>
+                boton.dispatchEvent(new MouseEvent(evt, {bubbles: true, cancelable: true, view: window})));
+            expandido = await estable(panel, 80, 250, Math.min(4000, restante()), true);
+        }
+
+        let texto = '';
+        for (const d of panel.querySelectorAll('div')) {
+            if (d.children.length > 20) continue;
+            const t = (d.innerText || '').trim();
+            if (t.length > texto.length && t.length < 30000) texto = t;
+        }
+        let titulo = '';
+        for (const h of panel.querySelectorAll('h1, h2, h3')) {
+            const t = (h.innerText || '').trim();
+            if (t.length > 3 && t.length < 120) { titulo = t; break; }
+        }
+        // Empresa y ubicación: las líneas cortas que siguen al título en el panel.
+        const lineas = (panel.innerText || '').split('\\n').map(s => s.trim()).filter(Boolean);
+        const iT = titulo ? lineas.indexOf(titulo) : -1;
+        const meta = iT >= 0 ? lineas.slice(iT + 1, iT + 3).filter(l => l.length < 80 && !/a través|via /i.test(l)) : [];
+        const partes = (meta[0] || '').split(/\\s+[•·]\\s+/);
+        const chips = [...new Set([...panel.querySelectorAll('span, div')]
+            .filter(e => e.children.length === 0)
+            .map(e => (e.innerText || '').trim())
+            .filter(t => t.length < 60 && /\\$|clp|usd|salario|sueldo|al mes|al año|por hora/i.test(t)))];
+
+        done({
+            ok: texto.length > 80, motivo: 'OK', url: location.href, url_cambio: !!url,
+            titulo: titulo || tituloBloque, titulo_bloque: tituloBloque,
+            empresa: partes[0] || '', ubicacion: partes[1] || meta[1] || '',
+            sueldo_chips: chips, texto: texto, expandido: expandido, ms: performance.now() - t0,
+        });
+    })().catch(e => done({ok: false, motivo: 'ERR: ' + e.message}));
+"""
+
+def _extraer_job_consolidado(driver, idx) -> dict:
+    """Click + esperas + expandir + extraer del job `idx` en un solo execute_async_script."""
+    try:
+        return driver.execute_async_script(_JS_JOB_CONSOLIDADO, idx, int(GOOGLE_TIMEOUT_JOB * 1000)) or {}
+    except Exception as e:
+        return {"ok": False, "motivo": f"ERR: {e}"}
+
+
+def _procesar_bloque(driver, idx, total, avisar, tiempos=None, modo=None):
+    """
+    Abre el bloque `idx`, expande y extrae su descripción. Devuelve la oferta
+    o None si no se pudo abrir. `avisar(msg)` reporta el estado a la UI (la
+    llamada puede venir de un hilo worker, así que no toca Streamlit directo).
+    Cada espera se resuelve por evento y su duración queda en `tiempos`, junto
+    con los round-trips WebDriver que costó el job según el modo usado.
+    """
+    tiempos = tiempos or TiemposPasos()
+    modo    = modo or GOOGLE_EXTRACCION
+    sep = "═" * 55
+    print(f"\n{sep}")
+    print(f"  🏢 TRABAJO {idx+1}/{total}")
+    print(sep)
+
+    contador = getattr(driver, "round_trips", None)
+    rt0 = contador.n if contador else 0
+    if modo == "consolidado":
+        avisar(f"⚡ [{idx+1}/{total}] Extrayendo oferta...")
+        with tiempos.medir("consolidado"):
+            datos = _extraer_job_consolidado(driver, idx)
+        if datos.get("ok"):
+            if contador:
+                tiempos.contar("round-trips/job consolidado", contador.n - rt0)
+            desc = datos["texto"]
+            chips = [c for c in datos.get("sueldo_chips", []) if c not in desc]
+            if chips:
+                desc += "\n" + " · ".join(chips)
+            print(f"  ⚡ Consolidado: '{datos['titulo']}' | {len(desc)} chars | {datos.get('ms', 0) / 1000:.2f}s")
+            return {
+                "nombre":  datos["titulo"],
+                "empresa": datos.get("empresa", ""),
+                "desc":    desc,
+                "url":     datos["url"],
+            }
+        print(f"  ⚠️ Consolidado falló ({datos.get('motivo')}). Usando camino paso a paso...")
+        rt0 = contador.n if contador else 0
+
+    # Siempre volver al doc principal antes de buscar bloques
+    try:
+        driver.switch_to.default_content()
+    except Exception:
+        pass
+
+    # Refrescar la referencia al bloque (el DOM puede haber cambiado)
+    try:
+        bloques = driver.find_elements(By.CSS_SELECTOR, "div.EimVGf")
+        if idx >= len(bloques):
+            print(f"  ⚠️ Bloque #{idx+1} desapareció del DOM. Saltando.")
+            return None
+        bloque = bloques[idx]
+    except Exception as e:
+        print(f"  ❌ Error obteniendo bloque: {e}")
+        return None
+
+    # ── PASO 1: Click en el bloque ──────────────────────────────────
+    url_antes = driver.current_url
+    with tiempos.medir("click"):
+        titulo_texto, click_ok = _click_bloque(driver, bloque, idx)
+    print(f"  [1] Título: '{titulo_texto}' | Click: {'✅' if click_ok else '❌'}")
+    if not click_ok:
+        print(f"  ❌ Click fallido. Saltando.")
+        return None
+
+    avisar(f"🖱️ [{idx+1}/{total}] **{titulo_texto}** — esperando panel...")
+
+    # ── PASO 2: Esperar que la URL cambie (identifica unívocamente el job abierto) ──
+    # La URL con #vhid= es el identificador irrefutable del job en el panel.
+    # Solo cuando la URL cambió sabemos que el panel ya empezó a cargar ESTE job.
+    t0 = time.perf_counter()
+    with tiempos.medir("url"):
+        url_este_job = _esperar_url_job(driver, url_antes)
+    if url_este_job:
+        print(f"  [2] ✅ URL cambió en {time.perf_counter()-t0:.1f}s → ...{url_este_job[-40:]}")
+    else:
+        url_este_job = driver.current_url
+        print(f"  [2] ⚠️ URL no cambió. Usando: ...{url_este_job[-40:]}")
+
+    # ── PASO 3: Esperar que el panel muestre el contenido del job con ESTA URL ──
+    # Google a veces renderiza el panel con el job anterior mientras carga el nuevo:
+    # el MutationObserver espera a que el panel deje de mutar.
+    with tiempos.medir("panel"):
+        estado = _esperar_panel_estable(driver)
+    print(f"  [2] Panel: {estado.get('motivo')} en {estado.get('ms', 0) / 1000:.2f}s")
+
+    # ── PASO 4: Expandir descripción ────────────────────────────────
+    avisar(f"📖 [{idx+1}/{total}] **{titulo_texto}** — expandiendo descripción...")
+    print(f"  [3] Buscando 'Mostrar descripción completa'...")
+    with tiempos.medir("expandir"):
+        expandido = _click_mostrar_descripcion(driver)
+    if expandido:
+        with tiempos.medir("expandida"):
+            estado = _esperar_panel_estable(driver, quieto_ms=250, timeout=4.0, requiere_cambio=True)
+        print(f"  [3] ✅ Expandida ({estado.get('motivo')} en {estado.get('ms', 0) / 1000:.2f}s)")
+    else:
+        print(f"  [3] ⚠️ Botón no encontrado (puede ya estar completa)")
+
+    # ── PASO 5: Extraer texto y verificar que la URL sigue siendo la correcta ──
+    # Si Google cambió la URL mientras expandíamos (raro pero posible), descartamos.
+    print(f"  [4] Extrayendo descripción...")
+    with tiempos.medir("extraer"):
+        texto_desc = _extraer_descripcion(driver)
+
+    url_al_extraer = driver.current_url
+    if url_al_extraer != url_este_job:
+        print(f"  [4] ⚠️ La URL cambió durante la extracción — panel fue a otro job. Reintentando...")
+        # El panel saltó a otro job — volver a clickear este bloque
+        driver.switch_to.default_content()
+        try:
+            with tiempos.medir("reintento"):
+                bloques = driver.find_elements(By.CSS_SELECTOR, "div.EimVGf")
+                bloque = bloques[idx]
+                url_antes = driver.current_url
+                _click_bloque(driver, bloque, idx)
+                _esperar_url_job(driver, url_antes)
+                _esperar_panel_estable(driver)
+                if _click_mostrar_descripcion(driver):
+                    _esperar_panel_estable(driver, quieto_ms=250, timeout=4.0, requiere_cambio=True)
+                texto_desc = _extraer_descripcion(driver)
+        except Exception as e:
+            print(f"  [4] ❌ Reintento fallido: {e}")
+
+    # ── Resultado ────────────────────────────────────────────────────
+    driver.switch_to.default_content()
+    current_url = driver.current_url
+    tiene_desc = bool(texto_desc)
+
+    print(f"  {'─'*50}")
+    print(f"  📊 RESULTADO {idx+1}/{total}:")
+    print(f"     Título:      {titulo_texto}")
+    print(f"     Descripción: {'✅ ' + str(len(texto_desc)) + ' chars' if tiene_desc else '❌ vacía'}")
+    print(f"     URL:         ...{current_url[-60:]}")
+
+    if contador:
+        tiempos.contar("round-trips/job legacy", contador.n - rt0)
+    return {
+        "nombre":  titulo_texto,
+        "empresa": "",
+        "desc":    texto_desc or f"[Sin descripción — {titulo_texto}]",
+        "url":     current_url,
+    }
+
+
+def _worker_google(url, indices, headless, eventos, wid, descripcion_completa=True):
+    """
+    Worker: toma un Chrome del DriverPool (reusando la página si ya tiene esta
+    búsqueda cargada), procesa solo los índices de bloque que le tocan y lo
+    devuelve al pool. Todo se reporta por la cola `eventos`.
+    Con la cosecha activa, las ofertas que ya traen descripción (o todas, si
+    `descripcion_completa` es False) salen sin abrir el panel.
+    """
+    pool, entrada, sano = obtener_pool_drivers(), None, True
+    tiempos = TiemposPasos()
+    try:
+        entrada = pool.adquirir(headless, url)
+        driver  = entrada.driver
+        total   = _bloques_cargados(driver) if entrada.url_cargada == url else 0
+        if total:
+            print(f"\n♻️ [worker {wid}] Reusando página ya cargada ({total} bloques).")
+        else:
+            entrada.url_cargada = None
+            with tiempos.medir("navegar"):
+                total = _cargar_bloques(driver, url)
+            entrada.url_cargada = url
+            entrada.paginas += 1
+        eventos.put(("total", total))
+        registros = []
+        if GOOGLE_COSECHA:
+            try:
+                with tiempos.medir("cosecha"):
+                    registros = _cosechar_resultados(driver)
+            except Exception as e:
+                print(f"  ⚠️ [worker {wid}] Cosecha falló ({e}). Abriendo cada panel.")
+        for idx in indices:
+            if idx >= total:
+                eventos.put(("procesado", None))
+                continue
+            reg = registros[idx] if idx < len(registros) else None
+            try:
+                if reg and (reg["desc"] or not descripcion_completa):
+                    oferta = _oferta_desde_registro(reg, url)
+                    tiempos.contar("fracción sin click", 1)
+                else:
+                    tiempos.contar("fracción sin click", 0)
+                    with tiempos.medir("job"):
+                        oferta = _procesar_bloque(driver, idx, total, lambda m: eventos.put(("estado", m)), tiempos)
+                    if oferta and reg:
+                        oferta["empresa"] = oferta["empresa"] or reg["empresa"]
+            except Exception as e:
+                print(f"  💥 [worker {wid}] Error en bloque #{idx+1}: {e}")
+                oferta = None
+            eventos.put(("procesado", oferta))
+    except TimeoutException:
+        eventos.put(("estado", "❌ No se encontraron bloques de trabajo en Google."))
+    except Exception as e:
+        sano = False
+        print(f"\n💥 [worker {wid}] Error inesperado: {e}")
+        import traceback; traceback.print_exc()
+    finally:
+        if entrada is not None:
+            pool.liberar(entrada, sano)
+        eventos.put(("tiempos", tiempos))
+        eventos.put(("fin", wid))
+
+
+def scrape_google_jobs(query, ubicacion, progress_bar, status_text, urls_vistas, desde_idx=0,
+                       lote=GOOGLE_LOTE, workers=1, headless=None, on_oferta=None,
+                       descripcion_completa=True):
+    """
+    Extrae los bloques [desde_idx, desde_idx+lote) de Google Jobs. Con
+    `workers` > 1 reparte los índices entre N Chrome (headless por defecto) que
+    trabajan en paralelo; las ofertas llegan por una cola y se reportan a la
+    UI (`on_oferta`) a medida que cada worker termina una. Con
+    `descripcion_completa=False` basta la cosecha de la página de resultados
+    (título, empresa y snippet) y no se abre ningún panel.
+    Devuelve (ofertas, siguiente_idx, total_disponibles).
+    """
+    print("\n" + "="*60)
+    print("🚀 Iniciando scrape_google_jobs")
+    print(f"   Query: {query} | Ubicación: {ubicacion} | Lote: {lote} | Workers: {workers}")
+    print("="*60)
+
+    url = _url_google_jobs(query, ubicacion)
+    headless = workers > 1 if headless is None else headless
+    status_text.markdown(f"🌐 Navegando a Google Jobs: `{query} {ubicacion}`...")
+    progress_bar.progress(0.05)
+
+    indices   = list(range(desde_idx, desde_idx + max(1, lote)))
+    n_workers = max(1, min(workers, len(indices)))
+    eventos   = queue.Queue()
+    hilos = [
+        threading.Thread(
+            target=_worker_google, args=(url, indices[w::n_workers], headless, eventos, w, descripcion_completa),
+            daemon=True,
+        )
+        for w in range(n_workers)
+    ]
+    for h in hilos:
+        h.start()
+
+    ofertas, total, procesados, vivos = [], None, 0, n_workers
+    tiempos = TiemposPasos()
+    while vivos:
+        tipo, dato = eventos.get()
+        if tipo == "total":
+            if total is None:
+                status_text.markdown(
+                    f"📋 {dato} trabajos detectados. Extrayendo ofertas "
+                    f"{desde_idx+1}–{min(dato, desde_idx + lote)}..."
+                )
+            total = max(total or 0, dato)
+        elif tipo == "estado":
+            status_text.markdown(dato)
+        elif tipo == "procesado":
+            procesados += 1
+            progress_bar.progress(0.05 + 0.90 * procesados / len(indices))
+            if dato is None:
+                continue
+            if agregar_si_nueva(urls_vistas, dato["url"]):
+                ofertas.append(dato)
+                print(f"  ✅ Guardada como oferta #{len(ofertas)}")
+                if on_oferta:
+                    on_oferta(dato)
+            else:
+                print(f"  ⏭️ URL duplicada — omitida")
+        elif tipo == "tiempos":
+            tiempos.fusionar(dato)
+        elif tipo == "fin":
+            vivos -= 1
+
+    if tiempos.pasos:
+        log.info(f"Google Jobs — tiempos por paso: {tiempos.resumen()}")
+
+    if total is None:
+        return [], desde_idx, 0
+
+    progress_bar.progress(1.0)
+    status_text.markdown(
+        f"🎉 Extracción completada — **{len(ofertas)} oferta(s)**.\n\n⏱️ {tiempos.resumen()}"
+    )
+    print(f"\n{'='*60}")
+    print(f"✅ scrape_google_jobs finalizado. Total: {len(ofertas)} ofertas.")
+    print("="*60 + "\n")
+    # Avanzar por bloques procesados (no por ofertas guardadas): así los duplicados no atascan "Ver más".
+    siguiente_idx = min(total, desde_idx + lote)
+    return ofertas, siguiente_idx, total
@@ -0,0 +1,689 @@
+"""
+Scraper de LinkedIn (búsqueda guest + detalle de cada oferta): token bucket,
+cache HTTP en disco, parsers intercambiables y paginación adaptativa.
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from datetime import datetime
+from random import random
+from urllib.parse import quote_plus
+
+import requests
+from urllib3.util import Retry
+from bs4 import BeautifulSoup
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:
+    etree = lxml_html = None
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
+from config import log, recurso_proceso
+from storage import agregar_si_nueva, normalizar_id_oferta
+
+
+# ─────────────────────────────────────────────
+# 8. LINKEDIN SCRAPER
+# ─────────────────────────────────────────────
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/122.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
+}
+
+# Base configurable para poder apuntar el scraper a un servidor local con HTML grabado.
+LINKEDIN_BASE_URL = os.environ.get("DREAMJOB_LINKEDIN_URL", "https://www.linkedin.com")
+LINKEDIN_RPS      = float(os.environ.get("DREAMJOB_LINKEDIN_RPS", "2.0"))
+
+
+class TokenBucket:
+    """Rate limiter thread-safe: `tasa` tokens por segundo, ráfagas de hasta `capacidad`."""
+
+    def __init__(self, tasa: float, capacidad: int = 1):
+        self.tasa      = tasa
+        self.capacidad = capacidad
+        self._tokens   = float(capacidad)
+        self._ultimo   = time.monotonic()
+        self._lock     = threading.Lock()
+
+    def tomar(self):
+        while True:
+            with self._lock:
+                ahora = time.monotonic()
+                self._tokens = min(self.capacidad, self._tokens + (ahora - self._ultimo) * self.tasa)
+                self._ultimo = ahora
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                espera = (1 - self._tokens) / self.tasa
+            time.sleep(espera)
+
+
+@recurso_proceso
+def _sesion_http() -> requests.Session:
+    """Session compartida con pool de conexiones (keep-alive entre páginas)."""
+    sesion  = requests.Session()
+    # Un reintento solo ante errores de conexión. Con un `max_retries` entero
+    # urllib3 además reintenta 429/503 con Retry-After por su cuenta, duplicando
+    # los reintentos y esperas de _fetch_detalle_linkedin, que ya los maneja.
+    reintentos = Retry(total=1, respect_retry_after_header=False)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=reintentos)
+    sesion.mount("https://", adapter)
+    sesion.mount("http://", adapter)
+    sesion.headers.update(HEADERS)
+    return sesion
+
+@recurso_proceso
+def _limitador_linkedin() -> TokenBucket:
+    return TokenBucket(LINKEDIN_RPS, capacidad=2)
+
+
+# ── Cache HTTP en disco ─────────────────────────────────────
+# Debajo de los fetch de LinkedIn (búsqueda y detalle): una misma URL pedida
+# dentro del TTL (rerun de Streamlit, doble click) sale de disco sin tocar la
+# red ni el rate limit. Vencido el TTL se revalida con ETag/Last-Modified; el
+# cuerpo se guarda comprimido con zlib y se desalojan las entradas menos
+# usadas cuando el archivo supera el tamaño máximo.
+HTTP_CACHE_DB  = "http_cache.db"
+HTTP_CACHE_MB  = float(os.environ.get("DREAMJOB_HTTP_CACHE_MB", "200"))
+HTTP_TTL_BUSQUEDA = int(os.environ.get("DREAMJOB_HTTP_TTL", "900"))  # segundos
+HTTP_TTL_DETALLE  = 7 * 24 * 3600
+
+
+class CacheHTTP:
+    """GET con cache en SQLite: TTL, revalidación condicional, zlib y desalojo LRU por tamaño."""
+
+    def __init__(self, ruta: str = HTTP_CACHE_DB, max_bytes: int = int(HTTP_CACHE_MB * 1024 * 1024)):
+        self.ruta      = ruta
+        self.max_bytes = max_bytes
+        self._lock     = threading.Lock()
+        self._con      = sqlite3.connect(ruta, check_same_thread=False)
+        with self._lock, self._con:
+            self._con.execute("PRAGMA journal_mode=WAL")
+            self._con.execute(
+                "CREATE TABLE IF NOT EXISTS respuestas ("
+                " url TEXT PRIMARY KEY, estado INTEGER, cuerpo BLOB, etag TEXT, last_modified TEXT,"
+                " guardado REAL, acceso REAL, bytes INTEGER)"
+            )
+            self._con.execute("CREATE INDEX IF NOT EXISTS ix_respuestas_acceso ON respuestas(acceso)")
+            self._bytes = self._con.execute("SELECT COALESCE(SUM(bytes), 0) FROM respuestas").fetchone()[0]
+        self.aciertos = self.revalidados = self.descargas = 0
+
+    @staticmethod
+    def _respuesta(url: str, estado: int, cuerpo: bytes, cabeceras: dict) -> requests.Response:
+        resp = requests.Response()
+        resp.url, resp.status_code, resp._content = url, estado, cuerpo
+        resp.headers.update(cabeceras)
+        resp.encoding = "utf-8"
+        return resp
+
+    def get(self, url: str, ttl: int, limitador: TokenBucket = None, timeout: int = 15) -> requests.Response:
+        """
+        Respuesta de `url`: desde disco si tiene menos de `ttl` segundos; si
+        no, GET condicional (304 → se reusa el cuerpo guardado). El token del
+        `limitador` solo se consume cuando hay que ir a la red.
+        """
+        ahora = time.time()
+        with self._lock:
+            fila = self._con.execute(
+                "SELECT estado, cuerpo, etag, last_modified, guardado FROM respuestas WHERE url=?", (url,)
+            ).fetchone()
+        if fila and ahora - fila[4] < ttl:
+            self._tocar(url, ahora)
+            self.aciertos += 1
+            return self._respuesta(url, fila[0], zlib.decompress(fila[1]), {"X-Cache": "HIT"})
+
+        cabeceras = {}
+        if fila and fila[2]:
+            cabeceras["If-None-Match"] = fila[2]
+        if fila and fila[3]:
+            cabeceras["If-Modified-Since"] = fila[3]
+        if limitador:
+            limitador.tomar()
+        log.debug("HTTP GET: %s", url)
+        resp = _sesion_http().get(url, timeout=timeout, headers=cabeceras)
+        if resp.status_code == 304 and fila:
+            with self._lock, self._con:
+                self._con.execute("UPDATE respuestas SET guardado=?, acceso=? WHERE url=?", (ahora, ahora, url))
+            self.revalidados += 1
+            return self._respuesta(url, fila[0], zlib.decompress(fila[1]), {"X-Cache": "REVALIDATED"})
+        self.descargas += 1
+        if resp.status_code == 200:
+            self._guardar(url, resp, ahora)
+        return resp
+
+    def _tocar(self, url: str, ahora: float):
+        with self._lock, self._con:
+            self._con.execute("UPDATE respuestas SET acceso=? WHERE url=?", (ahora, url))
+
+    def _guardar(self, url: str, resp: requests.Response, ahora: float):
+        cuerpo = zlib.compress(resp.content, 6)
+        with self._lock, self._con:
+            previo = self._con.execute("SELECT bytes FROM respuestas WHERE url=?", (url,)).fetchone()
+            self._con.execute(
+                "INSERT OR REPLACE INTO respuestas VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, resp.status_code, cuerpo, resp.headers.get("ETag"), resp.headers.get("Last-Modified"),
+                 ahora, ahora, len(cuerpo)),
+            )
+            self._bytes += len(cuerpo) - (previo[0] if previo else 0)
+            if self._bytes > self.max_bytes:
+                self._desalojar()
+
+    def _desalojar(self):
+        """Borra las entradas de acceso más antiguo hasta quedar bajo el 90% del máximo (con el lock tomado)."""
+        objetivo = self.max_bytes * 0.9
+        for url, n in self._con.execute("SELECT url, bytes FROM respuestas ORDER BY acceso").fetchall():
+            if self._bytes <= objetivo:
+                break
+            self._con.execute("DELETE FROM respuestas WHERE url=?", (url,))
+            self._bytes -= n
+
+    def tasa_aciertos(self) -> float:
+        total = self.aciertos + self.revalidados + self.descargas
+        return (self.aciertos + self.revalidados) / total if total else 0.0
+
+    def resumen(self) -> str:
+        total = self.aciertos + self.revalidados + self.descargas
+        return (
+            f"{self.aciertos + self.revalidados}/{total} desde cache ({self.tasa_aciertos():.0%}, "
+            f"{self.revalidados} revalidadas) · {self._bytes / 1024 / 1024:.1f} MB"
+        )
+
+
+@recurso_proceso
+def obtener_cache_http() -> CacheHTTP:
+    return CacheHTTP(HTTP_CACHE_DB)
+
+
+# ── Parsers de cards (backend intercambiable) ─────────────
+# Selectores compilados una sola vez al cargar el módulo. La regex/`contains`
+# sobre la clase replica el `class_=re.compile(...)` original.
+_RE_BASE_CARD   = re.compile(r"base-card")
+_RE_RESULT_CARD = re.compile(r"result-card")
+_RE_CARD_TITULO = re.compile(r"base-search-card__title")
+_RE_CARD_SUBT   = re.compile(r"base-search-card__subtitle")
+_RE_CARD_NESTED = re.compile(r"hidden-nested-link")
+_RE_CARD_LOC    = re.compile(r"job-search-card__location")
+
+def _item_card(titulo, empresa, href, ubicacion):
+    return {
+        "nombre":    titulo,
+        "empresa":   empresa or "Desconocida",
+        "url":       href.split("?")[0] if href else "#",
+        "ubicacion": ubicacion,
+    }
+
+def _parsear_cards_bs4(html: str) -> list:
+    """Fallback puro Python (BeautifulSoup + html.parser)."""
+    soup  = BeautifulSoup(html, "html.parser")
+    cards = soup.find_all("div", class_=_RE_BASE_CARD) or soup.find_all("li", class_=_RE_RESULT_CARD)
+    items = []
+    for card in cards:
+        try:
+            titulo_el = card.find("h3", class_=_RE_CARD_TITULO) or card.find("h3")
+            titulo = titulo_el.get_text(strip=True) if titulo_el else ""
+            if not titulo:
+                continue
+            empresa_el = card.find("h4", class_=_RE_CARD_SUBT) or card.find("a", class_=_RE_CARD_NESTED)
+            link_el    = card.find("a", href=True)
+            loc_el     = card.find("span", class_=_RE_CARD_LOC)
+            items.append(_item_card(
+                titulo,
+                empresa_el.get_text(strip=True) if empresa_el else "",
+                link_el["href"] if link_el else "",
+                loc_el.get_text(strip=True) if loc_el else "",
+            ))
+        except Exception as e:
+            log.warning(f"Card error: {e}")
+    return items
+
+if lxml_html is not None:
+    _XP_CARDS      = etree.XPath("//div[contains(@class,'base-card')]")
+    _XP_CARDS_ALT  = etree.XPath("//li[contains(@class,'result-card')]")
+    _XP_TITULO     = etree.XPath(".//h3[contains(@class,'base-search-card__title')]")
+    _XP_H3         = etree.XPath(".//h3")
+    _XP_SUBTITULO  = etree.XPath(".//h4[contains(@class,'base-search-card__subtitle')]")
+    _XP_NESTED     = etree.XPath(".//a[contains(@class,'hidden-nested-link')]")
+    _XP_LINK       = etree.XPath(".//a[@href]/@href")
+    _XP_LOC        = etree.XPath(".//span[contains(@class,'job-search-card__location')]")
+
+def _primero_lxml(card, *xpaths):
+    """Primer nodo del primer XPath que encuentre algo (mismo orden que los `or` de bs4)."""
+    for xp in xpaths:
+        nodos = xp(card)
+        if nodos:
+            return nodos[0]
+    return None
+
+def _texto_lxml(el) -> str:
+    # Igual que get_text(strip=True) de bs4: cada nodo de texto sin espacios, unidos sin separador.
+    return "".join(t.strip() for t in el.itertext()) if el is not None else ""
+
+def _parsear_cards_lxml(html: str) -> list:
+    doc   = lxml_html.fromstring(html)
+    cards = _XP_CARDS(doc) or _XP_CARDS_ALT(doc)
+    items = []
+    for card in cards:
+        try:
+            titulo = _texto_lxml(_primero_lxml(card, _XP_TITULO, _XP_H3))
+            if not titulo:
+                continue
+            items.append(_item_card(
+                titulo,
+                _texto_lxml(_primero_lxml(card, _XP_SUBTITULO, _XP_NESTED)),
+                _primero_lxml(card, _XP_LINK) or "",
+                _texto_lxml(_primero_lxml(card, _XP_LOC)),
+            ))
+        except Exception as e:
+            log.warning(f"Card error: {e}")
+    return items
+
+def _texto_slx(node) -> str:
+    return node.text(deep=True, separator="", strip=True) if node is not None else ""
+
+def _parsear_cards_selectolax(html: str) -> list:
+    doc   = SelectolaxParser(html)
+    cards = doc.css("div[class*='base-card']") or doc.css("li[class*='result-card']")
+    items = []
+    for card in cards:
+        try:
+            titulo_el = card.css_first("h3[class*='base-search-card__title']") or card.css_first("h3")
+            titulo = _texto_slx(titulo_el)
+            if not titulo:
+                continue
+            empresa_el = (card.css_first("h4[class*='base-search-card__subtitle']") or
+                          card.css_first("a[class*='hidden-nested-link']"))
+            link_el = card.css_first("a[href]")
+            items.append(_item_card(
+                titulo,
+                _texto_slx(empresa_el),
+                link_el.attributes.get("href", "") if link_el is not None else "",
+                _texto_slx(card.css_first("span[class*='job-search-card__location']")),
+            ))
+        except Exception as e:
+            log.warning(f"Card error: {e}")
+    return items
+
+PARSERS_LINKEDIN = {"bs4": _parsear_cards_bs4}
+if lxml_html is not None:
+    PARSERS_LINKEDIN["lxml"] = _parsear_cards_lxml
+if SelectolaxParser is not None:
+    PARSERS_LINKEDIN["selectolax"] = _parsear_cards_selectolax
+
+def _elegir_parser(nombre: str):
+    if nombre in PARSERS_LINKEDIN:
+        return PARSERS_LINKEDIN[nombre]
+    for preferido in ("selectolax", "lxml", "bs4"):
+        if preferido in PARSERS_LINKEDIN:
+            return PARSERS_LINKEDIN[preferido]
+
+# "auto" usa el backend más rápido instalado; DREAMJOB_PARSER=bs4 fuerza el fallback.
+PARSER_LINKEDIN = os.environ.get("DREAMJOB_PARSER", "auto")
+_parsear_cards_linkedin = _elegir_parser(PARSER_LINKEDIN)
+
+
+def _fetch_pagina_linkedin(url: str, limitador: TokenBucket):
+    return obtener_cache_http().get(url, HTTP_TTL_BUSQUEDA, limitador)
+
+
+def _clave_paginacion(query: str, ubicacion: str) -> str:
+    return f"linkedin|{query.strip().lower()}|{ubicacion.strip().lower()}"
+
+
+def _url_busqueda_linkedin(base_url: str, query: str, ubicacion: str, page: int) -> str:
+    return (
+        f"{base_url}/jobs/search?"
+        f"keywords={quote_plus(query)}&location={quote_plus(ubicacion)}"
+        f"&start={page * 25}&f_TPR=r2592000"
+    )
+
+
+def _racha_sin_nuevas(rendimiento: dict) -> int:
+    """Páginas seguidas sin ofertas nuevas al final del tramo ya completo (0, 1, 2, ...)."""
+    racha, page = 0, 0
+    while page in rendimiento:
+        racha = racha + 1 if rendimiento[page] == 0 else 0
+        page += 1
+    return racha
+
+
+def iterar_plan_linkedin(plan: list, paginas: int, progress_bar, status_text, urls_vistas,
+                         paralelo: int = 3, base_url: str = None, paginas_vacias: int = 1):
+    """
+    Generador: corre todas las consultas del `plan` a la vez, bajo el token
+    bucket compartido y deduplicando contra el mismo `urls_vistas` (una
+    VistasDedup o un set, con `agregar_si_nueva`: atómico entre hilos). Entrega `(query, ubicacion,
+    pagina, ofertas_nuevas)` en orden de llegada.
+
+    Paginación adaptativa por consulta: deja de pedir páginas tras
+    `paginas_vacias` páginas seguidas sin ofertas nuevas (o al acabarse los
+    resultados). Si `urls_vistas` es la VistasDedup persistente, el último
+    `start` productivo de cada consulta queda en su índice: hasta ahí se
+    piden hasta `paralelo / len(plan)` páginas por adelantado; más allá, de a
+    una, así que una corrida diaria solo baja la cabeza fresca de resultados.
+    """
+    base_url  = (base_url or LINKEDIN_BASE_URL).rstrip("/")
+    limitador = _limitador_linkedin()
+    ventana   = max(1, paralelo // max(1, len(plan)))
+    memoria   = getattr(urls_vistas, "indice", None)
+    estado    = []
+    for query, ubicacion in plan:
+        previo = memoria.ultimo_start(_clave_paginacion(query, ubicacion)) if memoria else None
+        estado.append({
+            "siguiente": 0, "en_vuelo": 0, "activa": True, "fallo": False, "rendimiento": {},
+            "especular_hasta": paginas if previo is None else previo // 25 + 1,
+        })
+    completadas, futuros = 0, {}
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, paralelo)) as pool:
+            def _lanzar(i):
+                e = estado[i]
+                while e["activa"] and e["siguiente"] < paginas and e["en_vuelo"] < (
+                    ventana if e["siguiente"] < e["especular_hasta"] else 1
+                ):
+                    query, ubicacion = plan[i]
+                    url = _url_busqueda_linkedin(base_url, query, ubicacion, e["siguiente"])
+                    futuros[pool.submit(_fetch_pagina_linkedin, url, limitador)] = (i, e["siguiente"])
+                    e["siguiente"] += 1
+                    e["en_vuelo"]  += 1
+
+            for i in range(len(plan)):
+                _lanzar(i)
+            while futuros:
+                listos, _ = wait(futuros, return_when=FIRST_COMPLETED)
+                for fut in listos:
+                    i, page = futuros.pop(fut)
+                    query, ubicacion = plan[i]
+                    e = estado[i]
+                    e["en_vuelo"] -= 1
+                    completadas += 1
+                    nuevas, cards = None, []
+                    try:
+                        resp = fut.result()
+                        if resp.status_code != 200:
+                            status_text.markdown(f"⚠️ `{query}` página {page+1}: HTTP {resp.status_code}")
+                        else:
+                            nuevas, cards = [], _parsear_cards_linkedin(resp.text)
+                            for item in cards:
+                                if not agregar_si_nueva(urls_vistas, item["url"]):
+                                    continue
+                                desc = f"{item['nombre']}. {item['empresa']}. {item['ubicacion']}."
+                                nuevas.append({"nombre": item["nombre"], "empresa": item["empresa"],
+                                               "desc": desc, "url": item["url"]})
+                    except requests.RequestException as ex:
+                        log.error(f"Red error LinkedIn: {ex}")
+                    except Exception as ex:  # p.ej. HTML inesperado: falla esta consulta, no el plan
+                        log.error(f"Error procesando `{query}` página {page+1}: {ex!r}")
+                        nuevas = None
+
+                    if nuevas is None:
+                        e["fallo"], e["activa"] = True, False
+                    else:
+                        e["rendimiento"][page] = len(nuevas)
+                        if nuevas:
+                            status_text.markdown(
+                                f"✅ `{query}` · {ubicacion} — página {page+1}: **{len(nuevas)} ofertas nuevas**"
+                            )
+                        if e["activa"] and not cards:
+                            e["activa"] = False
+                            status_text.markdown(f"🏁 `{query}` · {ubicacion} — fin de resultados en página {page+1}.")
+                        elif e["activa"] and _racha_sin_nuevas(e["rendimiento"]) >= paginas_vacias:
+                            e["activa"] = False
+                            status_text.markdown(
+                                f"⏹️ `{query}` · {ubicacion} — {paginas_vacias} página(s) sin ofertas nuevas "
+                                f"(hasta la {page+1}), se detiene."
+                            )
+                    _lanzar(i)
+                    pendientes = len(futuros) + sum(paginas - x["siguiente"] for x in estado if x["activa"])
+                    progress_bar.progress(completadas / (completadas + pendientes))
+                    if nuevas is not None:
+                        yield query, ubicacion, page, nuevas
+    finally:
+        for (query, ubicacion), e in zip(plan, estado):
+            rend = e["rendimiento"]
+            productivas = [p for p, n in rend.items() if n > 0]
+            start = max(productivas) * 25 if productivas else 0
+            log.info(
+                f"LinkedIn `{query}` ({ubicacion}): nuevas por página "
+                f"{[rend.get(p) for p in range(e['siguiente'])]} · último start productivo {start}"
+            )
+            if memoria is not None and rend and not e["fallo"]:
+                memoria.registrar_start(_clave_paginacion(query, ubicacion), start)
+
+
+def iterar_linkedin(query: str, ubicacion: str, paginas: int,
+                    progress_bar, status_text, urls_vistas,
+                    paralelo: int = 3, base_url: str = None, paginas_vacias: int = 1):
+    """
+    Generador para una sola consulta: hasta `paralelo` páginas en vuelo con
+    la Session compartida y el token bucket, entregando `(pagina,
+    ofertas_nuevas)` apenas termina cada una. El consumidor puede
+    puntuar/persistir mientras siguen bajando.
+    """
+    status_text.markdown(f"🔍 **{paginas} página(s)** — `{query}` en `{ubicacion}` ({paralelo} en paralelo)...")
+    progress_bar.progress(0.01)
+    for _, _, page, nuevas in iterar_plan_linkedin(
+        [(query, ubicacion)], paginas, progress_bar, status_text, urls_vistas, paralelo, base_url,
+        paginas_vacias,
+    ):
+        yield page, nuevas
+
+
+def scrape_linkedin(query: str, ubicacion: str, paginas: int,
+                    progress_bar, status_text, urls_vistas,
+                    paralelo: int = 3, base_url: str = None, paginas_vacias: int = 1) -> list:
+    """
+    Versión "todo junto" de iterar_linkedin: espera todas las páginas y
+    devuelve las ofertas en el orden de las páginas.
+    """
+    por_pagina = dict(iterar_linkedin(
+        query, ubicacion, paginas, progress_bar, status_text, urls_vistas, paralelo, base_url,
+        paginas_vacias,
+    ))
+    ofertas = [o for page in sorted(por_pagina) for o in por_pagina[page]]
+    progress_bar.progress(1.0)
+    status_text.markdown(f"🎉 **{len(ofertas)} ofertas** encontradas en LinkedIn.")
+    return ofertas
+
+
+# ── Enriquecimiento: descripción completa de cada oferta ───
+# La búsqueda solo trae título/empresa/ubicación. Esta segunda etapa baja el
+# detalle de cada oferta nueva (endpoint guest jobPosting) antes del match, con
+# reintentos + backoff y el mismo token bucket. El detalle se cachea en SQLite
+# por ID de oferta: ningún posting se descarga dos veces.
+LINKEDIN_DETALLE_DB = "ofertas_detalles.db"
+DETALLE_INTENTOS    = 3
+DETALLE_BACKOFF     = 1.0  # segundos base; se duplica en cada reintento
+
+_XP_DETALLE_DESC     = '//div[contains(@class, "show-more-less-html__markup")]'
+_XP_DETALLE_CRITERIO = '//li[contains(@class, "description__job-criteria-item")]'
+
+
+class CacheDetalles:
+    """Detalle de ofertas LinkedIn por ID (`li:<id>`), persistido en SQLite."""
+
+    def __init__(self, ruta: str = LINKEDIN_DETALLE_DB):
+        self._lock = threading.Lock()
+        self._con  = sqlite3.connect(ruta, check_same_thread=False)
+        with self._lock, self._con:
+            self._con.execute("PRAGMA journal_mode=WAL")
+            self._con.execute(
+                "CREATE TABLE IF NOT EXISTS detalles ("
+                " id TEXT PRIMARY KEY, estado INTEGER, descripcion TEXT, criterios TEXT, fecha TEXT)"
+            )
+
+    def obtener(self, ids) -> dict:
+        """{id: {"estado", "descripcion", "criterios"}} de los que ya están en cache."""
+        ids, salida = list(ids), {}
+        with self._lock:
+            for i in range(0, len(ids), 500):
+                lote = ids[i:i+500]
+                filas = self._con.execute(
+                    f"SELECT id, estado, descripcion, criterios FROM detalles"
+                    f" WHERE id IN ({','.join('?' * len(lote))})", lote
+                )
+                for id_, estado, desc, criterios in filas:
+                    salida[id_] = {"estado": estado, "descripcion": desc, "criterios": json.loads(criterios)}
+        return salida
+
+    def guardar(self, id_oferta: str, detalle: dict):
+        with self._lock, self._con:
+            self._con.execute(
+                "INSERT OR REPLACE INTO detalles VALUES (?, ?, ?, ?, ?)",
+                (id_oferta, detalle["estado"], detalle["descripcion"],
+                 json.dumps(detalle["criterios"], ensure_ascii=False), datetime.now().isoformat()),
+            )
+
+
+@recurso_proceso
+def obtener_cache_detalles() -> CacheDetalles:
+    return CacheDetalles(LINKEDIN_DETALLE_DB)
+
+
+def _parsear_detalle_linkedin(html: str) -> tuple:
+    """HTML del jobPosting guest → (descripción en texto plano, {criterio: valor})."""
+    if lxml_html is not None:
+        doc = lxml_html.fromstring(html)
+        nodos = doc.xpath(_XP_DETALLE_DESC)
+        desc = ""
+        if nodos:
+            for br in nodos[0].iter("br"):
+                br.tail = "\n" + (br.tail or "")
+            for bloque in nodos[0].iter("p", "ul", "ol", "li", "div", "h1", "h2", "h3", "h4"):
+                bloque.text = "\n" + (bloque.text or "")
+                bloque.tail = "\n" + (bloque.tail or "")
+            desc = nodos[0].text_content()
+        criterios = {}
+        for li in doc.xpath(_XP_DETALLE_CRITERIO):
+            k, v = li.xpath('.//h3'), li.xpath('.//span')
+            if k and v:
+                criterios[k[0].text_content().strip()] = v[0].text_content().strip()
+    else:
+        soup = BeautifulSoup(html, "html.parser")
+        nodo = soup.select_one("div.show-more-less-html__markup")
+        desc = nodo.get_text("\n") if nodo else ""
+        criterios = {}
+        for li in soup.select("li.description__job-criteria-item"):
+            k, v = li.find("h3"), li.find("span")
+            if k and v:
+                criterios[k.get_text(strip=True)] = v.get_text(strip=True)
+    desc = "\n".join(l.strip() for l in desc.splitlines() if l.strip())
+    return desc, criterios
+
+
+def _fetch_detalle_linkedin(job_id: str, limitador: TokenBucket, base_url: str) -> dict:
+    """
+    GET del jobPosting con reintentos: 429/5xx y errores de red reintentan con
+    backoff exponencial + jitter (respetando Retry-After); 404 se cachea como
+    ausente para no volver a pedirlo.
+    """
+    url = f"{base_url}/jobs-guest/jobs/api/jobPosting/{job_id}"
+    for intento in range(DETALLE_INTENTOS):
+        espera = DETALLE_BACKOFF * 2 ** intento * (1 + random() / 2)
+        ultimo = intento + 1 == DETALLE_INTENTOS  # tras el último intento no se espera
+        try:
+            resp = obtener_cache_http().get(url, HTTP_TTL_DETALLE, limitador)
+        except requests.RequestException as e:
+            log.warning(f"Detalle LinkedIn {job_id}: {e} (intento {intento+1}/{DETALLE_INTENTOS})")
+            if not ultimo:
+                time.sleep(espera)
+            continue
+        if resp.status_code == 200:
+            desc, criterios = _parsear_detalle_linkedin(resp.text)
+            return {"estado": 200, "descripcion": desc, "criterios": criterios}
+        if resp.status_code in (404, 410):
+            return {"estado": resp.status_code, "descripcion": "", "criterios": {}}
+        if resp.status_code == 429 or resp.status_code >= 500:
+            retry_after = resp.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                espera = max(espera, float(retry_after))
+            if ultimo:
+                log.warning(f"Detalle LinkedIn {job_id}: HTTP {resp.status_code}, sin más reintentos")
+                break
+            log.warning(f"Detalle LinkedIn {job_id}: HTTP {resp.status_code}, reintento en {espera:.1f}s")
+            time.sleep(espera)
+            continue
+        log.warning(f"Detalle LinkedIn {job_id}: HTTP {resp.status_code}")
+        return None
+    return None
+
+
+def _desc_con_detalle(oferta: dict, detalle: dict) -> str:
+    """Cabecera de la card + descripción completa + criterios (nivel, jornada, ...)."""
+    partes = [oferta["desc"], detalle["descripcion"]]
+    partes += [f"{k}: {v}" for k, v in detalle["criterios"].items()]
+    return "\n\n".join(p for p in partes if p)
+
+
+def enriquecer_linkedin(ofertas: list, progress_bar, status_text,
+                        paralelo: int = 3, base_url: str = None) -> dict:
+    """
+    Completa en sitio `desc` de las ofertas LinkedIn con la descripción del
+    detalle. Lo cacheado se aplica de inmediato; el resto se descarga en un
+    pool de `paralelo` hilos bajo el rate limit compartido.
+    Devuelve {"cache": n, "descargadas": n, "fallidas": n}.
+    """
+    base_url  = (base_url or LINKEDIN_BASE_URL).rstrip("/")
+    cache     = obtener_cache_detalles()
+    limitador = _limitador_linkedin()
+
+    por_id = {}
+    for o in ofertas:
+        i = normalizar_id_oferta(o.get("url", ""))
+        if i.startswith("li:"):
+            por_id.setdefault(i, []).append(o)
+    stats = {"cache": 0, "descargadas": 0, "fallidas": 0}
+    if not por_id:
+        return stats
+
+    for i, detalle in cache.obtener(por_id).items():
+        for o in por_id.pop(i):
+            o["desc"] = _desc_con_detalle(o, detalle)
+        stats["cache"] += 1
+
+    pendientes = len(por_id)
+    status_text.markdown(
+        f"📄 Descargando detalle de **{pendientes} oferta(s)** ({stats['cache']} ya en cache)..."
+    )
+    progress_bar.progress(0.0 if pendientes else 1.0)
+    completadas = 0
+    with ThreadPoolExecutor(max_workers=max(1, paralelo)) as pool:
+        futuros = {pool.submit(_fetch_detalle_linkedin, i[3:], limitador, base_url): i for i in por_id}
+        for fut in as_completed(futuros):
+            i = futuros[fut]
+            completadas += 1
+            try:
+                detalle = fut.result()
+            except Exception as e:
+                log.error(f"Detalle LinkedIn {i}: {e}")
+                detalle = None
+            if detalle is None:
+                stats["fallidas"] += 1
+            else:
+                cache.guardar(i, detalle)
+                for o in por_id[i]:
+                    o["desc"] = _desc_con_detalle(o, detalle)
+                stats["descargadas"] += 1
+            progress_bar.progress(completadas / pendientes)
+
+    log.info(f"Enriquecimiento LinkedIn: {stats}")
+    status_text.markdown(
+        f"📄 Detalle: **{stats['descargadas']}** descargadas · {stats['cache']} desde cache"
+        + (f" · ⚠️ {stats['fallidas']} fallidas" if stats["fallidas"] else "")
+    )
+    return stats
@@ -0,0 +1,714 @@
+"""
+Persistencia de ofertas: el historial (SQLite o journal JSONL) y el índice
+de dedup compartido por los scrapers.
+"""
+import bisect
+import hashlib
+import io
+import json
+import mmap
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import unicodedata
+from datetime import datetime
+
+from config import OFERTAS_FILE, escribir_json_atomico, log, recurso_proceso
+
+
+# ─────────────────────────────────────────────
+# 2. PERSISTENCIA OFERTAS (SQLite)
+# ─────────────────────────────────────────────
+OFERTAS_DB = "ofertas.db"
+
+CAMPOS_OFERTA = (
+    "nombre", "empresa", "url", "desc", "puntaje", "sueldo",
+    "skills", "experiencia", "beneficios", "ultima_actualizacion",
+)
+
+# ── Búsqueda de texto ──────────────────────────────────────
+CAMPOS_TEXTO = ("nombre", "empresa", "desc")
+_RE_TOKEN    = re.compile(r"\w+")
+_RE_MARCAS   = re.compile(r"[\u0300-\u036f]")
+
+def tokens_texto(texto: str) -> list:
+    """Tokens en minúscula y sin tildes ("Ingeniería" → "ingenieria"), como unicode61."""
+    return _RE_TOKEN.findall(_RE_MARCAS.sub("", unicodedata.normalize("NFKD", (texto or "").lower())))
+
+def consulta_fts(texto: str) -> str:
+    """Cada palabra del usuario como prefijo, todas obligatorias: `python sen` → `"python"* "sen"*`."""
+    return " ".join(f'"{t}"*' for t in tokens_texto(texto))
+
+
+class IndiceTexto:
+    """
+    Índice invertido en memoria (token → URLs) para el backend journal o un
+    SQLite sin FTS5. Se actualiza por oferta en cada upsert; los prefijos se
+    resuelven con bisect sobre el vocabulario ordenado.
+    """
+
+    def __init__(self, ofertas=()):
+        self._lock     = threading.Lock()
+        self._postings = {}
+        self._por_url  = {}
+        self._fechas   = {}  # url → ultima_actualizacion, para ordenar sin ir a la base
+        self._vocab    = []
+        self.agregar(ofertas)
+
+    def agregar(self, ofertas):
+        with self._lock:
+            for o in ofertas:
+                url = o.get("url")
+                if not url:
+                    continue
+                tokens  = frozenset(tokens_texto(" ".join(o.get(c) or "" for c in CAMPOS_TEXTO)))
+                previos = self._por_url.get(url, frozenset())
+                for t in previos - tokens:
+                    self._postings[t].discard(url)
+                for t in tokens - previos:
+                    urls = self._postings.get(t)
+                    if urls is None:
+                        urls = self._postings[t] = set()
+                        bisect.insort(self._vocab, t)
+                    urls.add(url)
+                self._por_url[url] = tokens
+                self._fechas[url]  = o.get("ultima_actualizacion") or ""
+
+    def buscar(self, consulta: str) -> set:
+        terminos = sorted(set(tokens_texto(consulta)), key=len, reverse=True)  # los largos filtran más
+        if not terminos:
+            return set()
+        resultado = None
+        with self._lock:
+            for termino in terminos:
+                urls = set()
+                i = bisect.bisect_left(self._vocab, termino)
+                while i < len(self._vocab) and self._vocab[i].startswith(termino):
+                    urls |= self._postings[self._vocab[i]]
+                    i += 1
+                resultado = urls if resultado is None else resultado & urls
+                if not resultado:
+                    break
+        return resultado
+
+    def recientes(self, urls, limite: int = None) -> list:
+        """`urls` por ultima_actualizacion DESC, url (el mismo orden en cada llamada)."""
+        with self._lock:
+            urls = sorted(urls)
+            urls.sort(key=lambda u: self._fechas.get(u, ""), reverse=True)  # estable: desempata por url
+        return urls[:limite] if limite else urls
+
+
+class OfertasStore:
+    """
+    Historial de ofertas en SQLite (modo WAL), con upsert por URL. Guardar
+    cuesta O(ofertas nuevas) en vez de reescribir todo el historial, y la
+    lectura es paginada por keyset para no cargar el archivo completo.
+    """
+
+    def __init__(self, ruta: str = OFERTAS_DB):
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(ruta, check_same_thread=False)
+        self._con.row_factory = sqlite3.Row
+        with self._lock, self._con:
+            self._con.execute("PRAGMA journal_mode=WAL")
+            self._con.execute("PRAGMA synchronous=NORMAL")
+            self._con.executescript("""
+                CREATE TABLE IF NOT EXISTS ofertas (
+                    url                  TEXT PRIMARY KEY,
+                    nombre               TEXT,
+                    empresa              TEXT,
+                    desc                 TEXT,
+                    puntaje              INTEGER,
+                    sueldo               TEXT,
+                    skills               TEXT,
+                    experiencia          TEXT,
+                    beneficios           TEXT,
+                    ultima_actualizacion TEXT
+                );
+                CREATE INDEX IF NOT EXISTS ix_ofertas_empresa ON ofertas(empresa);
+                CREATE INDEX IF NOT EXISTS ix_ofertas_puntaje ON ofertas(puntaje);
+                CREATE INDEX IF NOT EXISTS ix_ofertas_actualizacion ON ofertas(ultima_actualizacion, url);
+                CREATE TABLE IF NOT EXISTS meta (clave TEXT PRIMARY KEY, valor TEXT);
+            """)
+        self._indice = None  # IndiceTexto, solo si el SQLite no trae FTS5
+        self._fts    = self._crear_fts()
+
+    def _crear_fts(self) -> bool:
+        """
+        Índice FTS5 (sin tildes) sobre nombre/empresa/desc, con contenido
+        externo: los triggers lo mantienen al día dentro de la misma
+        transacción del upsert. La primera vez se reconstruye desde la tabla.
+        """
+        try:
+            with self._lock, self._con:
+                existia = self._con.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name='ofertas_fts'"
+                ).fetchone()
+                self._con.executescript("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS ofertas_fts USING fts5(
+                        nombre, empresa, desc,
+                        content='ofertas', content_rowid='rowid',
+                        tokenize='unicode61 remove_diacritics 2'
+                    );
+                    CREATE TRIGGER IF NOT EXISTS ofertas_fts_ai AFTER INSERT ON ofertas BEGIN
+                        INSERT INTO ofertas_fts(rowid, nombre, empresa, desc)
+                        VALUES (new.rowid, new.nombre, new.empresa, new.desc);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS ofertas_fts_ad AFTER DELETE ON ofertas BEGIN
+                        INSERT INTO ofertas_fts(ofertas_fts, rowid, nombre, empresa, desc)
+                        VALUES ('delete', old.rowid, old.nombre, old.empresa, old.desc);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS ofertas_fts_au AFTER UPDATE OF nombre, empresa, desc ON ofertas
+                    WHEN old.nombre IS NOT new.nombre OR old.empresa IS NOT new.empresa OR old.desc IS NOT new.desc
+                    BEGIN
+                        INSERT INTO ofertas_fts(ofertas_fts, rowid, nombre, empresa, desc)
+                        VALUES ('delete', old.rowid, old.nombre, old.empresa, old.desc);
+                        INSERT INTO ofertas_fts(rowid, nombre, empresa, desc)
+                        VALUES (new.rowid, new.nombre, new.empresa, new.desc);
+                    END;
+                """)
+                if not existia:
+                    self._con.execute("INSERT INTO ofertas_fts(ofertas_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError as e:
+            log.warning(f"SQLite sin FTS5 ({e}): la búsqueda usa un índice en memoria.")
+            return False
+
+    # ── Escritura ────────────────────────────────────────
+    def upsert(self, ofertas: list) -> int:
+        filas = [tuple(o.get(c) for c in CAMPOS_OFERTA) for o in ofertas]
+        cols = ", ".join(CAMPOS_OFERTA)
+        marcas = ", ".join("?" for _ in CAMPOS_OFERTA)
+        updates = ", ".join(f"{c}=excluded.{c}" for c in CAMPOS_OFERTA if c != "url")
+        with self._lock, self._con:
+            self._con.executemany(
+                f"INSERT INTO ofertas ({cols}) VALUES ({marcas}) "
+                f"ON CONFLICT(url) DO UPDATE SET {updates}",
+                filas,
+            )
+            self._con.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('fecha_ultima_busqueda', ?)",
+                (datetime.now().isoformat(),),
+            )
+        if self._indice is not None:
+            self._indice.agregar(ofertas)
+        return len(filas)
+
+    # ── Lectura ──────────────────────────────────────────
+    def total(self) -> int:
+        with self._lock:
+            return self._con.execute("SELECT COUNT(*) FROM ofertas").fetchone()[0]
+
+    def urls(self) -> set:
+        with self._lock:
+            return {r[0] for r in self._con.execute("SELECT url FROM ofertas")}
+
+    def meta(self, clave: str):
+        with self._lock:
+            r = self._con.execute("SELECT valor FROM meta WHERE clave=?", (clave,)).fetchone()
+        return r[0] if r else None
+
+    def pagina(self, despues_de: tuple = None, limite: int = 500) -> tuple:
+        """
+        Página ordenada por (ultima_actualizacion, url). `despues_de` es el
+        cursor devuelto por la página anterior; devuelve (ofertas, cursor),
+        con cursor None al llegar al final.
+        """
+        sql = f"SELECT {', '.join(CAMPOS_OFERTA)} FROM ofertas"
+        args = []
+        if despues_de:
+            sql += " WHERE (ultima_actualizacion, url) > (?, ?)"
+            args.extend(despues_de)
+        sql += " ORDER BY ultima_actualizacion, url LIMIT ?"
+        args.append(limite)
+        with self._lock:
+            filas = [dict(r) for r in self._con.execute(sql, args)]
+        cursor = (filas[-1]["ultima_actualizacion"], filas[-1]["url"]) if len(filas) == limite else None
+        return filas, cursor
+
+    def obtener(self, urls: list) -> list:
+        """Ofertas completas de `urls`, en el mismo orden."""
+        por_url = {}
+        for i in range(0, len(urls), 500):
+            trozo = urls[i:i + 500]
+            sql = (f"SELECT {', '.join(CAMPOS_OFERTA)} FROM ofertas "
+                   f"WHERE url IN ({', '.join('?' for _ in trozo)})")
+            with self._lock:
+                por_url.update((r["url"], dict(r)) for r in self._con.execute(sql, trozo))
+        return [por_url[u] for u in urls if u in por_url]
+
+    def buscar(self, consulta: str, limite: int = None) -> list:
+        """
+        URLs del historial que contienen todas las palabras de `consulta`
+        (como prefijo, sin distinguir tildes). Con `limite`, las más
+        relevantes primero (sin FTS5, las más recientes).
+        """
+        if not self._fts:
+            if self._indice is None:
+                self._indice = IndiceTexto(self.iterar())
+            # Sin bm25: las más recientes primero, para que `limite` sea estable.
+            return self._indice.recientes(self._indice.buscar(consulta), limite)
+        expresion = consulta_fts(consulta)
+        if not expresion:
+            return []
+        # Rankear con bm25 solo vale la pena para un top-K; para filtrar basta el set.
+        if limite:
+            sql = ("SELECT o.url FROM ofertas_fts JOIN ofertas o ON o.rowid = ofertas_fts.rowid "
+                   "WHERE ofertas_fts MATCH ? ORDER BY bm25(ofertas_fts, 10.0, 5.0, 1.0) LIMIT ?")
+            args = (expresion, limite)
+        else:
+            sql = "SELECT url FROM ofertas WHERE rowid IN (SELECT rowid FROM ofertas_fts WHERE ofertas_fts MATCH ?)"
+            args = (expresion,)
+        with self._lock:
+            return [r[0] for r in self._con.execute(sql, args)]
+
+    def iterar(self, lote: int = 500):
+        cursor = None
+        while True:
+            filas, cursor = self.pagina(cursor, lote)
+            yield from filas
+            if cursor is None:
+                break
+
+    def exportar_json(self, f):
+        """Escribe el historial a `f` en el formato de ofertas_encontradas.json, por lotes."""
+        f.write("{\n")
+        f.write(f'  "fecha_ultima_busqueda": {json.dumps(self.meta("fecha_ultima_busqueda"))},\n')
+        f.write(f'  "total_historico": {self.total()},\n')
+        f.write('  "ofertas": [')
+        for i, o in enumerate(self.iterar()):
+            f.write(",\n    " if i else "\n    ")
+            f.write(json.dumps(o, ensure_ascii=False))
+        f.write("\n  ]\n}\n")
+
+    # ── Migración ────────────────────────────────────────
+    def migrar_desde_json(self, ruta_json: str = OFERTAS_FILE) -> int:
+        """Importa una sola vez el historial JSON previo (si existe)."""
+        if self.meta("migrado_json") or not os.path.exists(ruta_json):
+            return 0
+        try:
+            with open(ruta_json, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            log.error(f"Error leyendo historial para migrar: {e}")
+            return 0
+        n = self.upsert([o for o in data.get("ofertas", []) if o.get("url")])
+        with self._lock, self._con:
+            self._con.execute("INSERT OR REPLACE INTO meta VALUES ('migrado_json', ?)", (ruta_json,))
+            if data.get("fecha_ultima_busqueda"):
+                self._con.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('fecha_ultima_busqueda', ?)",
+                    (data["fecha_ultima_busqueda"],),
+                )
+        log.info(f"Migradas {n} ofertas desde {ruta_json} a {self.ruta}.")
+        return n
+
+
+class OfertasJournal:
+    """
+    Alternativa sin base de datos (DREAMJOB_STORAGE=jsonl), con la misma API
+    que OfertasStore. Cada upsert se agrega como una línea al journal
+    `<historial>.journal.jsonl`; el snapshot es el propio OFERTAS_FILE en JSON
+    compacto. Al cargar se reproduce snapshot + journal. Cuando el journal
+    crece, un hilo en segundo plano lo compacta en un snapshot nuevo (archivo
+    temporal + rename), así que un proceso interrumpido nunca deja el
+    historial truncado: a lo sumo se pierde la última línea a medio escribir.
+    """
+    COMPACTAR_CADA = 2_000  # líneas de journal
+
+    def __init__(self, ruta_snapshot: str = OFERTAS_FILE):
+        self.ruta            = ruta_snapshot
+        self.ruta_journal    = os.path.splitext(ruta_snapshot)[0] + ".journal.jsonl"
+        self.ruta_compactando = self.ruta_journal + ".compactando"
+        self._lock      = threading.Lock()
+        self._ofertas   = {}
+        self._fecha     = None
+        self._lineas    = 0
+        self._orden     = None  # claves ordenadas para la paginación, se invalida al escribir
+        self._indice    = None  # IndiceTexto, se arma en la primera búsqueda
+        self._compactando = False
+        self._cargar()
+
+    def _cargar(self):
+        if os.path.exists(self.ruta):
+            try:
+                with open(self.ruta, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._fecha = data.get("fecha_ultima_busqueda")
+                for o in data.get("ofertas", []):
+                    if o.get("url"):
+                        self._ofertas[o["url"]] = o
+            except Exception as e:
+                log.error(f"Error leyendo snapshot {self.ruta}: {e}")
+        for ruta in (self.ruta_compactando, self.ruta_journal):
+            if not os.path.exists(ruta):
+                continue
+            with open(ruta, "r", encoding="utf-8") as f:
+                for linea in f:
+                    try:
+                        o = json.loads(linea)
+                    except ValueError:
+                        continue  # línea truncada por un corte a mitad de escritura
+                    self._ofertas[o["url"]] = o
+                    self._fecha = o.get("ultima_actualizacion") or self._fecha
+                    self._lineas += 1
+        self._reparar_cola()
+        log.info(f"Journal: {len(self._ofertas)} ofertas cargadas ({self._lineas} líneas de journal).")
+
+    def _reparar_cola(self):
+        """Corta una última línea incompleta para que el próximo append no se pegue a ella."""
+        if not os.path.exists(self.ruta_journal):
+            return
+        with open(self.ruta_journal, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            fin = f.tell()
+            if fin == 0:
+                return
+            f.seek(fin - 1)
+            if f.read(1) == b"\n":
+                return
+            bloque = min(fin, 64 * 1024)
+            while True:
+                f.seek(fin - bloque)
+                corte = f.read(bloque).rfind(b"\n")
+                if corte >= 0 or bloque == fin:
+                    break
+                bloque = min(fin, bloque * 2)
+            f.truncate(fin - bloque + corte + 1 if corte >= 0 else 0)
+            log.warning(f"Journal: línea final incompleta descartada en {self.ruta_journal}.")
+
+    # ── Escritura ────────────────────────────────────────
+    def upsert(self, ofertas: list) -> int:
+        filas = [{c: o.get(c) for c in CAMPOS_OFERTA} for o in ofertas]
+        with self._lock:
+            with open(self.ruta_journal, "a", encoding="utf-8") as f:
+                for o in filas:
+                    f.write(json.dumps(o, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            for o in filas:
+                self._ofertas[o["url"]] = o
+            self._fecha = datetime.now().isoformat()
+            self._lineas += len(filas)
+            self._orden = None
+            compactar = self._lineas >= self.COMPACTAR_CADA and not self._compactando
+            if compactar:
+                self._compactando = True
+            if self._indice is not None:
+                self._indice.agregar(filas)
+        if compactar:
+            threading.Thread(target=self.compactar, daemon=True).start()
+        return len(filas)
+
+    def compactar(self):
+        """Pliega el journal en un snapshot compacto nuevo."""
+        with self._lock:
+            self._compactando = True
+            if os.path.exists(self.ruta_journal) and not os.path.exists(self.ruta_compactando):
+                os.replace(self.ruta_journal, self.ruta_compactando)
+            salida = {
+                "fecha_ultima_busqueda": self._fecha,
+                "total_historico": len(self._ofertas),
+                "ofertas": list(self._ofertas.values()),
+            }
+            self._lineas = 0
+        try:
+            escribir_json_atomico(self.ruta, salida, separators=(",", ":"))
+            if os.path.exists(self.ruta_compactando):
+                os.remove(self.ruta_compactando)
+            log.info(f"Journal compactado: {salida['total_historico']} ofertas.")
+        except Exception as e:
+            log.error(f"Error compactando journal: {e}")
+        finally:
+            with self._lock:
+                self._compactando = False
+
+    # ── Lectura ──────────────────────────────────────────
+    def total(self) -> int:
+        return len(self._ofertas)
+
+    def urls(self) -> set:
+        with self._lock:
+            return set(self._ofertas)
+
+    def meta(self, clave: str):
+        return self._fecha if clave == "fecha_ultima_busqueda" else None
+
+    def pagina(self, despues_de: tuple = None, limite: int = 500) -> tuple:
+        with self._lock:
+            if self._orden is None:
+                self._orden = sorted(
+                    (o.get("ultima_actualizacion") or "", u) for u, o in self._ofertas.items()
+                )
+            orden = self._orden
+            i = bisect.bisect_right(orden, tuple(despues_de)) if despues_de else 0
+            claves = orden[i:i + limite]
+            filas = [dict(self._ofertas[u]) for _, u in claves]
+        cursor = claves[-1] if len(claves) == limite else None
+        return filas, cursor
+
+    def obtener(self, urls: list) -> list:
+        with self._lock:
+            return [dict(self._ofertas[u]) for u in urls if u in self._ofertas]
+
+    def buscar(self, consulta: str, limite: int = None) -> list:
+        """
+        Igual que OfertasStore.buscar sin FTS5: las más recientes primero
+        (ultima_actualizacion DESC, url), así ambos backends entregan la misma
+        primera tanda.
+        """
+        with self._lock:
+            if self._indice is None:
+                self._indice = IndiceTexto(self._ofertas.values())
+        return self._indice.recientes(self._indice.buscar(consulta), limite)
+
+    iterar       = OfertasStore.iterar
+    exportar_json = OfertasStore.exportar_json
+
+    def migrar_desde_json(self, ruta_json: str = OFERTAS_FILE) -> int:
+        return 0  # el snapshot ya es el JSON histórico
+
+
+STORAGE_BACKEND = os.environ.get("DREAMJOB_STORAGE", "sqlite")
+
+@recurso_proceso
+def obtener_store():
+    if STORAGE_BACKEND == "jsonl":
+        return OfertasJournal(OFERTAS_FILE)
+    store = OfertasStore(OFERTAS_DB)
+    store.migrar_desde_json(OFERTAS_FILE)
+    return store
+
+
+# ── Dedup de ofertas ───────────────────────────────────────
+DEDUP_BLOOM_FILE = "ofertas_ids.bloom"
+DEDUP_DB         = "ofertas_ids.db"
+
+_RE_LINKEDIN_ID = re.compile(r"linkedin\.com/jobs/view/(?:[^/?#]*-)?(\d+)")
+_RE_CURRENT_JOB = re.compile(r"[?&]currentJobId=(\d+)")
+_RE_GOOGLE_VHID = re.compile(r"[#&]vhid=([^&#]+)")
+
+def normalizar_id_oferta(url: str) -> str:
+    """
+    ID estable de una oferta a partir de su URL: el id numérico de LinkedIn
+    (`/jobs/view/programador-at-cramer-4375014980` → `li:4375014980`), el
+    `vhid` de Google Jobs, o la URL tal cual para el resto.
+    """
+    url = (url or "").strip()
+    m = _RE_LINKEDIN_ID.search(url) or _RE_CURRENT_JOB.search(url)
+    if m:
+        return f"li:{m.group(1)}"
+    m = _RE_GOOGLE_VHID.search(url)
+    if m:
+        return f"g:{m.group(1)}"
+    return url.rstrip("/")
+
+
+class BloomMmap:
+    """Filtro de Bloom sobre un archivo mapeado en memoria: abrirlo es O(1)."""
+
+    def __init__(self, ruta: str, bits: int = 1 << 24, k: int = 7):
+        self.bits, self.k = bits, k
+        nuevo = not os.path.exists(ruta) or os.path.getsize(ruta) != bits // 8
+        if nuevo:
+            with open(ruta, "wb") as f:
+                f.truncate(bits // 8)
+        self._f = open(ruta, "r+b")
+        self._mm = mmap.mmap(self._f.fileno(), bits // 8)
+        self.nuevo = nuevo
+
+    def _posiciones(self, clave: str):
+        d = hashlib.blake2b(clave.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(d[:8], "little")
+        h2 = int.from_bytes(d[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.k)]
+
+    def __contains__(self, clave: str) -> bool:
+        return all(self._mm[p >> 3] & (1 << (p & 7)) for p in self._posiciones(clave))
+
+    def add(self, clave: str):
+        for p in self._posiciones(clave):
+            self._mm[p >> 3] |= 1 << (p & 7)
+
+    def flush(self):
+        self._mm.flush()
+
+
+class IndiceDedup:
+    """
+    Servicio de dedup compartido por todos los scrapers. El Bloom en mmap
+    descarta en O(1) la gran mayoría de las URLs nunca vistas; solo ante un
+    "quizás" se confirma contra el set exacto de IDs normalizados en SQLite.
+    """
+
+    def __init__(self, ruta_bloom: str = DEDUP_BLOOM_FILE, ruta_db: str = DEDUP_DB):
+        self._lock  = threading.Lock()
+        self.bloom  = BloomMmap(ruta_bloom)
+        self._con   = sqlite3.connect(ruta_db, check_same_thread=False)
+        with self._lock, self._con:
+            self._con.execute("PRAGMA journal_mode=WAL")
+            self._con.execute("CREATE TABLE IF NOT EXISTS ids (id TEXT PRIMARY KEY)")
+            self._con.execute(
+                "CREATE TABLE IF NOT EXISTS paginacion (consulta TEXT PRIMARY KEY, start INTEGER, fecha TEXT)"
+            )
+        if self.bloom.nuevo:
+            self._reconstruir()
+
+    def _reconstruir(self):
+        """Primera vez (o Bloom perdido): poblar desde el set exacto y el historial."""
+        with self._lock:
+            existentes = [r[0] for r in self._con.execute("SELECT id FROM ids")]
+        for i in existentes:
+            self.bloom.add(i)
+        self.agregar(obtener_store().urls())
+        log.info(f"Índice de dedup reconstruido: {len(existentes)} IDs previos.")
+
+    def contiene_id(self, id_oferta: str) -> bool:
+        if id_oferta not in self.bloom:
+            return False
+        with self._lock:
+            return self._con.execute("SELECT 1 FROM ids WHERE id=?", (id_oferta,)).fetchone() is not None
+
+    def ultimo_start(self, consulta: str):
+        """Último `start` de paginación que trajo ofertas nuevas para la consulta (None si nunca corrió)."""
+        with self._lock:
+            r = self._con.execute("SELECT start FROM paginacion WHERE consulta=?", (consulta,)).fetchone()
+        return r[0] if r else None
+
+    def registrar_start(self, consulta: str, start: int):
+        with self._lock, self._con:
+            self._con.execute(
+                "INSERT OR REPLACE INTO paginacion VALUES (?, ?, ?)",
+                (consulta, start, datetime.now().isoformat()),
+            )
+
+    def agregar(self, urls):
+        ids = {normalizar_id_oferta(u) for u in urls if u}
+        if not ids:
+            return
+        with self._lock, self._con:
+            self._con.executemany("INSERT OR IGNORE INTO ids VALUES (?)", [(i,) for i in ids])
+            for i in ids:
+                self.bloom.add(i)
+            self.bloom.flush()
+
+
+class VistasDedup:
+    """
+    Vista de URLs ya vistas que los scrapers reciben como `urls_vistas`: lo
+    ya persistido vive en el IndiceDedup, lo encontrado en esta búsqueda se
+    acumula en memoria hasta que guardar_ofertas_json lo persiste. Los
+    scrapers la consultan con `agregar_si_nueva` (vía la función del mismo
+    nombre); `in` / `add` quedan para el resto del código.
+    """
+
+    def __init__(self, indice: IndiceDedup):
+        self.indice = indice
+        self._locales = set()
+        self._lock = threading.Lock()
+
+    def __contains__(self, url) -> bool:
+        i = normalizar_id_oferta(url)
+        with self._lock:
+            return i in self._locales or self.indice.contiene_id(i)
+
+    def add(self, url):
+        with self._lock:
+            self._locales.add(normalizar_id_oferta(url))
+
+    def agregar_si_nueva(self, url) -> bool:
+        """
+        `in` + `add` atómico: True solo para el primer hilo que ve la oferta.
+        La misma vista se comparte entre consultas que corren en paralelo.
+        """
+        i = normalizar_id_oferta(url)
+        with self._lock:
+            if i in self._locales or self.indice.contiene_id(i):
+                return False
+            self._locales.add(i)
+            return True
+
+
+_LOCK_VISTAS = threading.Lock()
+
+def agregar_si_nueva(urls_vistas, url) -> bool:
+    """
+    Marca `url` como vista y dice si era nueva. Con una VistasDedup usa su
+    `agregar_si_nueva`; un `set` simple (tests, scripts) también sirve, con
+    `in` + `add` bajo un lock del módulo.
+    """
+    if isinstance(urls_vistas, VistasDedup):
+        return urls_vistas.agregar_si_nueva(url)
+    with _LOCK_VISTAS:
+        if url in urls_vistas:
+            return False
+        urls_vistas.add(url)
+        return True
+
+
+@recurso_proceso
+def obtener_dedup() -> IndiceDedup:
+    return IndiceDedup(DEDUP_BLOOM_FILE, DEDUP_DB)
+
+
+def guardar_ofertas_json(ofertas_raw: list, resultados_match: list):
+    """
+    Upsert de las ofertas analizadas en el store (solo las nuevas/actualizadas).
+    El cache de extracción lo baja a disco quien puntuó (scoring.cache_extraccion).
+    """
+    match_por_url = {r.get("URL", ""): r for r in resultados_match}
+    ahora = datetime.now().isoformat()
+    filas = []
+    for o in ofertas_raw:
+        url   = o.get("url", "#")
+        match = match_por_url.get(url, {})
+        filas.append({
+            "nombre":      o.get("nombre", ""),
+            "empresa":     o.get("empresa", ""),
+            "url":         url,
+            "desc":        o.get("desc", ""),
+            "puntaje":     match.get("Puntaje"),
+            "sueldo":      match.get("Sueldo"),
+            "skills":      match.get("Skills"),
+            "experiencia": match.get("Experiencia"),
+            "beneficios":  match.get("Beneficios"),
+            "ultima_actualizacion": ahora,
+        })
+    store = obtener_store()
+    try:
+        store.upsert(filas)
+        obtener_dedup().agregar(f["url"] for f in filas)
+        log.info(f"Persistencia exitosa: {len(filas)} ofertas (historial: {store.total()}).")
+    except Exception as e:
+        log.error(f"Error escribiendo {store.ruta}: {e}")
+    return store.ruta
+
+EXPORTAR_SPOOL_MB = 16  # hasta aquí el export se arma en memoria; más grande, en un temporal en disco
+
+def exportar_historial_json() -> bytes:
+    """
+    JSON de descarga armado desde el store. Se escribe por lotes a un
+    SpooledTemporaryFile (en memoria hasta EXPORTAR_SPOOL_MB, después en
+    disco) y se devuelven sus bytes: st.download_button los necesita
+    completos igual, y el temporal queda cerrado y borrado en toda plataforma.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=EXPORTAR_SPOOL_MB * 1024 * 1024, mode="w+b") as tmp:
+        texto = io.TextIOWrapper(tmp, encoding="utf-8")
+        obtener_store().exportar_json(texto)
+        texto.flush()
+        texto.detach()  # cerrar el wrapper cerraría también el temporal
+        tmp.seek(0)
+        return tmp.read()
+
+
+def cargar_urls_existentes() -> "VistasDedup":
+    """
+    Conjunto de URLs ya vistas para una búsqueda. No lee el historial: consulta
+    el índice de dedup persistente (Bloom + set exacto) y acumula en memoria
+    las URLs nuevas de esta búsqueda hasta que se persisten.
+    """
+    return VistasDedup(obtener_dedup())
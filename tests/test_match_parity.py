@@ -0,0 +1,102 @@
+"""
+Paridad del scoring: MatchEngine (calcular_match) y el scoring matricial
+(calcular_match_batch) deben dar exactamente lo mismo que el cálculo oferta
+por oferta original, con `in` por término y extracción directa por regex.
+"""
+import pytest
+
+from config import DEFAULT_PERFIL
+from scoring import (
+    MatchEngine, calcular_match, calcular_match_batch, extraer_experiencia, extraer_sueldo,
+    match_experiencia, match_lista, match_sueldo,
+)
+
+
+def calcular_match_base(oferta: dict, perfil: dict) -> dict:
+    """calcular_match tal como estaba antes del MatchEngine."""
+    nombre = oferta.get("nombre", "")
+    desc   = oferta.get("desc", "")
+
+    cargos = perfil.get("cargos", [])
+    pts_c, nombre_display = 0, nombre
+    for i, cargo in enumerate(cargos):
+        if cargo.lower() in nombre.lower():
+            pts_c = 10 * (len(cargos) - i) * perfil.get("prioridad_cargos", 9) // 5
+            nombre_display = f"✅ {nombre}"
+            break
+
+    pts_sk, txt_sk = match_lista(desc, perfil["skills"], es_priorizada=True)
+    pts_sk = pts_sk * perfil["prioridad_skills"] // 5
+    pts_s, txt_s = match_sueldo(
+        extraer_sueldo(desc), perfil["renta_min"], perfil["renta_max"], perfil["prioridad_sueldo"]
+    )
+    pts_e, txt_e = match_experiencia(
+        extraer_experiencia(desc),
+        perfil["experiencia_min"], perfil["experiencia_max"], perfil["prioridad_experiencia"]
+    )
+    pts_b, txt_b = match_lista(desc, perfil["beneficios"], es_priorizada=True)
+    pts_b = pts_b * perfil["prioridad_beneficios"] // 5
+
+    return {
+        "Puntaje":      pts_c + pts_sk + pts_s + pts_e + pts_b,
+        "Nombre":       nombre_display,
+        "Empresa":      oferta.get("empresa", ""),
+        "URL":          oferta.get("url", "#"),
+        "Sueldo":       txt_s,
+        "Skills":       txt_sk,
+        "Experiencia":  txt_e,
+        "Beneficios":   txt_b,
+        "Descripcion":  desc,
+    }
+
+
+OFERTAS = [
+    {"nombre": "Tech Lead Python", "empresa": "Acme", "url": "u1",
+     "desc": "Buscamos Python y PostgreSQL. Renta $2.500.000 líquidos. 5 años de experiencia. Trabajo remoto."},
+    {"nombre": "Senior JavaScript Developer", "empresa": "Beta", "url": "u2",
+     "desc": "JavaScript, React y Node. Sueldo 1.800 mil. Seguro Médico y bono anual. 12 years."},
+    {"nombre": "Software Architect", "empresa": "", "url": "u3",
+     "desc": "Arquitectura en Java, MySQL. Ofrecemos 900k brutos. Mínimo 2 años."},
+    {"nombre": "fullstack developer", "empresa": "Gamma", "url": "u4",
+     "desc": "Stack SQL + react. Renta 3500000. Híbrido, BONO de desempeño."},
+    {"nombre": "Analista de Datos", "empresa": "Delta", "url": "u5",
+     "desc": "Sin mención de sueldo ni experiencia."},
+    {"nombre": "Ingeniería de Software", "empresa": "Épsilon", "url": "u6", "desc": ""},
+    {"nombre": "Desarrollador", "empresa": "Zeta", "url": "u7",
+     "desc": "Pythonista con 1,200,000 mensuales y 30 años de trayectoria; remoto 100%."},
+]
+
+PERFILES = [
+    DEFAULT_PERFIL,
+    {**DEFAULT_PERFIL, "skills": ["Java", "JavaScript", "SQL", "PostgreSQL"], "cargos": ["developer"]},
+    {**DEFAULT_PERFIL, "renta_min": 2_000_000, "renta_max": 1_000_000},  # rango invertido
+    {**DEFAULT_PERFIL, "experiencia_min": 8, "experiencia_max": 3, "cargos": [], "beneficios": []},
+]
+
+
+def _normalizar(fila: dict) -> dict:
+    return {**fila, "Puntaje": int(fila["Puntaje"])}
+
+
+@pytest.fixture(autouse=True)
+def _sin_archivos(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # el cache de extracción no lee ni deja sidecars en el repo
+
+
+@pytest.mark.parametrize("perfil", PERFILES)
+def test_calcular_match_igual_al_original(perfil):
+    for oferta in OFERTAS:
+        assert calcular_match(oferta, perfil) == calcular_match_base(oferta, perfil)
+
+
+@pytest.mark.parametrize("perfil", PERFILES)
+def test_match_engine_igual_al_original(perfil):
+    motor = MatchEngine(perfil.get("cargos", []), perfil["skills"], perfil["beneficios"])
+    for oferta in OFERTAS:
+        assert motor.calcular(oferta, perfil) == calcular_match_base(oferta, perfil)
+
+
+@pytest.mark.parametrize("perfil", PERFILES)
+def test_batch_igual_al_original(perfil):
+    lote = [_normalizar(r) for r in calcular_match_batch(OFERTAS, perfil).to_dict("records")]
+    assert lote == [calcular_match_base(o, perfil) for o in OFERTAS]
@@ -0,0 +1,204 @@
+"""
+Scraper LinkedIn contra un servidor HTTP local (`base_url`) que sirve HTML
+grabado de tests/fixtures: parseo de cards, páginas que terminan en
+cualquier orden y el enriquecimiento con el detalle (reintentos con
+Retry-After y cache por ID).
+"""
+import http.server
+import os
+import re
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import scrapers_linkedin as sl
+from config import ReporteProgreso
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def _fixture(nombre: str) -> str:
+    with open(os.path.join(FIXTURES, nombre), encoding="utf-8") as f:
+        return f.read()
+
+
+class ServidorFixture:
+    """
+    ThreadingHTTPServer en un puerto libre. `responder(ruta, query)` devuelve
+    (estado, cabeceras, cuerpo, demora); cada GET queda en `pedidos`.
+    """
+
+    def __init__(self):
+        self.responder = lambda ruta, query: (404, {}, "", 0)
+        self.pedidos   = []
+        servidor = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                servidor.pedidos.append(self.path)
+                estado, cabeceras, cuerpo, demora = servidor.responder(url.path, parse_qs(url.query))
+                time.sleep(demora)
+                datos = cuerpo.encode("utf-8")
+                self.send_response(estado)
+                for k, v in cabeceras.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(datos)))
+                self.end_headers()
+                self.wfile.write(datos)
+
+            def log_message(self, *args):
+                pass
+
+        self._http = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self._http.server_address[1]}"
+        threading.Thread(target=self._http.serve_forever, daemon=True).start()
+
+    def pedidos_a(self, prefijo: str) -> list:
+        return [p for p in self.pedidos if p.startswith(prefijo)]
+
+    def cerrar(self):
+        self._http.shutdown()
+        self._http.server_close()
+
+
+@pytest.fixture
+def servidor():
+    s = ServidorFixture()
+    yield s
+    s.cerrar()
+
+
+@pytest.fixture(autouse=True)
+def _aislado(tmp_path, monkeypatch):
+    """Caches en disco dentro de tmp_path, sin rate limit real y con backoff corto."""
+    recursos = (sl.obtener_cache_http, sl.obtener_cache_detalles, sl._limitador_linkedin)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sl, "LINKEDIN_RPS", 1000.0)
+    monkeypatch.setattr(sl, "DETALLE_BACKOFF", 0.01)
+    for recurso in recursos:
+        recurso.cache_clear()
+    yield
+    for recurso in recursos:
+        recurso.cache_clear()
+
+
+def _otra_pagina(html: str, desplazamiento: int) -> str:
+    """La misma página grabada con otros IDs de oferta (para simular la página siguiente)."""
+    return re.sub(r"\d{10}", lambda m: str(int(m.group()) + desplazamiento), html)
+
+
+ESPERADAS = [
+    {"nombre": "Python Developer", "empresa": "Cramer",
+     "url": "https://cl.linkedin.com/jobs/view/python-developer-at-cramer-4375014980",
+     "ubicacion": "Santiago, Región Metropolitana de Santiago, Chile"},
+    {"nombre": "Ingeniero de Datos Senior", "empresa": "Banco Austral",
+     "url": "https://cl.linkedin.com/jobs/view/ingeniero-de-datos-senior-at-banco-austral-4381122334",
+     "ubicacion": "Valparaíso, Chile"},
+    {"nombre": "Tech Lead (Remoto)", "empresa": "DataHub",
+     "url": "https://cl.linkedin.com/jobs/view/tech-lead-at-datahub-4390000111",
+     "ubicacion": "Chile"},
+]
+
+
+@pytest.mark.parametrize("parser", sorted(sl.PARSERS_LINKEDIN))
+def test_parsea_pagina_grabada(parser):
+    assert sl.PARSERS_LINKEDIN[parser](_fixture("linkedin_busqueda.html")) == ESPERADAS
+
+
+def test_scrape_contra_servidor_local(servidor):
+    html = _fixture("linkedin_busqueda.html")
+    servidor.responder = lambda ruta, q: (200, {}, html if q["start"] == ["0"] else "<ul></ul>", 0)
+    reporte = ReporteProgreso()
+
+    ofertas = sl.scrape_linkedin("Python Developer", "Chile", 3, reporte, reporte, set(),
+                                 base_url=servidor.base_url)
+
+    assert [o["url"] for o in ofertas] == [e["url"] for e in ESPERADAS]
+    assert ofertas[0]["desc"] == "Python Developer. Cramer. Santiago, Región Metropolitana de Santiago, Chile."
+    busquedas = servidor.pedidos_a("/jobs/search")
+    assert all("keywords=Python+Developer&location=Chile" in b for b in busquedas)
+    assert any("start=0&" in b for b in busquedas)
+
+
+def test_paginas_llegan_en_cualquier_orden(servidor):
+    html = _fixture("linkedin_busqueda.html")
+
+    def responder(ruta, q):
+        start = int(q["start"][0])
+        if start >= 50:
+            return 200, {}, "<ul></ul>", 0
+        # La primera página tarda más: las siguientes se entregan antes que ella.
+        return 200, {}, _otra_pagina(html, start), 0.5 if start == 0 else 0
+
+    servidor.responder = responder
+    reporte = ReporteProgreso()
+
+    llegadas = list(sl.iterar_linkedin("Python", "Chile", 3, reporte, reporte, set(),
+                                       paralelo=3, base_url=servidor.base_url))
+
+    assert llegadas[-1][0] == 0
+    assert {p: len(n) for p, n in llegadas} == {0: 3, 1: 3, 2: 0}
+    por_pagina = dict(llegadas)
+    assert por_pagina[1][0]["url"].endswith("-4375015005")  # IDs de la página 2, no de la 1
+
+
+# ── Enriquecimiento con el detalle ────────────────────────
+def _oferta(url: str) -> dict:
+    return {"nombre": "Python Developer", "empresa": "Cramer", "desc": "Python Developer. Cramer.", "url": url}
+
+
+def test_detalle_reintenta_429_respetando_retry_after(servidor):
+    detalle = _fixture("linkedin_detalle.html")
+    respuestas = [(429, {"Retry-After": "1"}, "", 0), (200, {}, detalle, 0)]
+    servidor.responder = lambda ruta, q: respuestas.pop(0)
+
+    t0 = time.perf_counter()
+    resultado = sl._fetch_detalle_linkedin("4375014980", sl._limitador_linkedin(), servidor.base_url)
+    transcurrido = time.perf_counter() - t0
+
+    assert resultado["estado"] == 200
+    assert "3 años de experiencia con Python y SQL" in resultado["descripcion"]
+    assert resultado["criterios"] == {"Nivel de antigüedad": "Intermedio", "Tipo de empleo": "Jornada completa"}
+    assert servidor.pedidos_a("/jobs-guest/jobs/api/jobPosting/") == [
+        "/jobs-guest/jobs/api/jobPosting/4375014980"] * 2
+    assert transcurrido >= 1.0  # esperó el Retry-After, no solo el backoff de 10 ms
+
+
+def test_detalle_sin_espera_tras_el_ultimo_intento(servidor):
+    servidor.responder = lambda ruta, q: (503, {"Retry-After": "1"}, "", 0)
+
+    t0 = time.perf_counter()
+    resultado = sl._fetch_detalle_linkedin("4375014980", sl._limitador_linkedin(), servidor.base_url)
+
+    assert resultado is None
+    assert len(servidor.pedidos) == sl.DETALLE_INTENTOS
+    assert time.perf_counter() - t0 < sl.DETALLE_INTENTOS  # dos esperas de 1 s, no tres
+
+
+def test_enriquecer_no_vuelve_a_pedir_un_id_cacheado(servidor):
+    detalle = _fixture("linkedin_detalle.html")
+    servidor.responder = lambda ruta, q: (200, {}, detalle, 0)
+    reporte = ReporteProgreso()
+
+    primera = [_oferta("https://cl.linkedin.com/jobs/view/python-developer-at-cramer-4375014980")]
+    stats = sl.enriquecer_linkedin(primera, reporte, reporte, base_url=servidor.base_url)
+    assert stats == {"cache": 0, "descargadas": 1, "fallidas": 0}
+    assert "Renta: $2.500.000 líquidos." in primera[0]["desc"]
+    assert "Tipo de empleo: Jornada completa" in primera[0]["desc"]
+
+    # Misma oferta con otra URL (slug y tracking distintos): mismo ID, sin pedido nuevo.
+    segunda = [_oferta("https://www.linkedin.com/jobs/view/4375014980/?trackingId=xyz")]
+    stats = sl.enriquecer_linkedin(segunda, reporte, reporte, base_url=servidor.base_url)
+    assert stats == {"cache": 1, "descargadas": 0, "fallidas": 0}
+    assert segunda[0]["desc"] == primera[0]["desc"]
+    assert len(servidor.pedidos) == 1
+
+    # También sobrevive al proceso: la cache de detalles está en disco.
+    sl.obtener_cache_detalles.cache_clear()
+    tercera = [_oferta("https://cl.linkedin.com/jobs/view/python-developer-at-cramer-4375014980")]
+    assert sl.enriquecer_linkedin(tercera, reporte, reporte, base_url=servidor.base_url)["cache"] == 1
+    assert len(servidor.pedidos) == 1